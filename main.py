@@ -1,20 +1,184 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 import os
+import io
+import codecs
 import re
 import json
+import shutil
+import tempfile
+import locale
 import subprocess
 import threading
+import queue
+import selectors
+from concurrent.futures import ThreadPoolExecutor
 import sys
 from utils.ai_service import AIService
 
+# Settings (de)serialisation: orjson when installed, stdlib json otherwise
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = lambda obj: json.dumps(obj, indent=4).encode('utf-8')
+
+KEYWORDS = frozenset({
+    'def', 'class', 'if', 'elif', 'else', 'for', 'while', 'return', 'import',
+    'from', 'as', 'try', 'except', 'finally', 'with', 'lambda', 'yield', 'pass',
+    'break', 'continue', 'and', 'or', 'not', 'in', 'is', 'None', 'True', 'False'
+})
+
+# Syntax highlighting tokenizer: one pass, group names are the tag names.
+# Earlier alternatives win, so keywords inside strings/comments aren't tagged.
+# Identifiers are matched generically and checked against KEYWORDS, which is
+# cheaper than a long keyword alternation. The pattern avoids lookbehind so it
+# also compiles under RE2 (google-re2), a non-backtracking engine used when
+# installed.
+_TOKEN_PATTERN = (
+    r'(?P<comment>#[^\n]*)'
+    r'|(?P<string>"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')'
+    r'|(?P<funcdef>\bdef\s+\w+)'
+    r'|(?P<name>\b[A-Za-z_]\w*)'
+    r'|(?P<number>\b\d+\.?\d*\b)'
+)
+try:
+    import re2
+    _RE_TOKEN = re2.compile(_TOKEN_PATTERN)
+except Exception:  # Not installed, or unsupported syntax
+    _RE_TOKEN = re.compile(_TOKEN_PATTERN)
+_HIGHLIGHT_TAGS = ("comment", "string", "function", "keyword", "number")
+
+# Oldest terminal lines are dropped past this, so appends stay cheap
+MAX_TERM_LINES = 5000
+MODIFIED_PREFIX = "● "  # Tab title marker for unsaved changes
+
+# Process umask, read once at import for the mode of newly saved files
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Body of the Help > About box
+_ABOUT_TEXT = (
+    "Code Editor v1.0\n\n"
+    "A VS Code-inspired text editor built with Tkinter\n\n"
+    "Features:\n"
+    "* Syntax highlighting for Python\n"
+    "* File explorer with context menu\n"
+    "* Find and replace\n"
+    "* Line numbers\n"
+    "* Multiple tabs\n"
+    "* Status bar\n"
+    "* AI-powered code completion and explanation\n"
+)
+
+# Body of the Help > Keyboard Shortcuts window
+_SHORTCUTS_TEXT = """KEYBOARD SHORTCUTS
+
+FILE OPERATIONS
+Ctrl+N         New File
+Ctrl+O         Open File
+Ctrl+S         Save File
+Ctrl+Shift+S   Save As
+Ctrl+W         Close Tab
+
+EDITING
+Ctrl+Z         Undo
+Ctrl+Y         Redo
+Ctrl+Shift+Z   Redo
+Ctrl+X         Cut
+Ctrl+C         Copy
+Ctrl+V         Paste
+
+SEARCH
+Ctrl+F         Find
+Ctrl+H         Find and Replace
+
+NAVIGATION
+Ctrl+Tab       Next Tab
+Ctrl+Shift+Tab Previous Tab
+
+VIEW
+(Menu) Toggle Sidebar
+(Menu) Zoom In
+(Menu) Zoom Out
+
+FILE EXPLORER
+Double-click   Open File
+Right-click    Context Menu
+  - New File
+  - New Folder
+  - Rename
+  - Delete
+  - Refresh
+
+TAB CLOSING
+Right-click    Close Tab
+Middle-click   Close Tab
+Ctrl+W         Close Current Tab
+"""
+
+class _TabInfo:
+    """State for one editor tab"""
+    __slots__ = ('text_widget', 'line_numbers', 'tab_frame', 'file_path', 'title',
+                 'modified', 'edit_pending', 'line_hash', 'dirty_lines', 'loading',
+                 'line_count', 'hl_view', 'hl_version', 'stale_theme')
+    
+    def __init__(self, text_widget, line_numbers, tab_frame, file_path, title):
+        self.text_widget = text_widget
+        self.line_numbers = line_numbers
+        self.tab_frame = tab_frame
+        self.file_path = file_path
+        self.title = title
+        self.modified = False
+        self.edit_pending = False  # An edit is queued for _process_edit
+        self.line_hash = {}        # Line number -> hash of the text last highlighted
+        self.dirty_lines = set()   # Lines edited since they were last highlighted
+        self.loading = False       # Content is still being streamed in
+        self.line_count = 0        # Line count the gutter width was last sized for
+        self.hl_view = None        # (first, last) lines highlighted with no edits since
+        self.hl_version = 0        # Bumped per pass/edit so stale background results are dropped
+        self.stale_theme = False   # Theme changed while this tab was hidden
+
 class CodeEditor:
     def __init__(self, root):
         self.root = root
         self.sidebar_visible = True
         self.open_tabs = {}  # Track file paths for each tab
+        self._tabid_by_widget = {}  # Text widget -> tab id
+        self._tab_order = []  # Tab ids in notebook order
+        self._path_to_tabid = {}  # Normalized open file path -> tab id
+        self._debouncers = {}  # Debounce key -> pending after() id
+        self._current_tab_info_cache = None  # Selected tab's info, reset on tab change
+        self._status_text = (None, None)  # (right, left) status text last set by update_status_bar
+        self._hl_executor = ThreadPoolExecutor(max_workers=1)  # Tokenizes off the Tk thread
+        self._save_executor = ThreadPoolExecutor(max_workers=1)  # Writes saved files, one at a time
+        self._save_futures = set()  # Saves submitted but not finished yet
+        self._exiting = False  # Exit requested; waiting on _save_futures
+        self._py_exe = sys.executable  # Interpreter used to run files
         self.untitled_count = 0
         self.find_dialog = None
+        self.replace_dialog = None
+        self._find_entry = None  # Search entries of the reusable dialogs
+        self._replace_find_entry = None
+        self._help_window = None  # Reusable keyboard shortcuts window
+        
+        # File explorer windowing: folder item -> [entries, next index]
+        self._node_children = {}
+        self._more_rows = {}  # "… N more" sentinel item -> folder item
+        self._tree_window = 50
+        self._extend_pending = False
+        self._dummy_child = {}  # Unexpanded folder item -> placeholder child
+        self._tree_nodes = {}  # Path -> tree item, for rows currently shown
+        self._tree_items = {}  # Tree item -> (path, is_dir)
+        self._scan_cache = {}  # Path -> entries scanned ahead of time
+        self._scan_cache_lock = threading.Lock()
+        self._prewarm_open = True  # Cleared by the first populate_tree; later scans aren't cached
+        
+        # Run output: reader threads queue text, the Tk thread drains it in batches
+        self._term_queue = queue.Queue()
+        self._term_producers = 0  # Runs whose output is still being read
         
         # AI features
         self.ai_service = None
@@ -71,6 +235,10 @@ class CodeEditor:
         
         # Load settings
         self.load_settings()
+        self._refresh_cached_style()
+        
+        # Start reading the working directory while the UI is being built
+        threading.Thread(target=self._prewarm_cwd, daemon=True).start()
         
         self.setup_window()
         self.create_menu_bar()
@@ -98,8 +266,8 @@ class CodeEditor:
         
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    self.settings = json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    self.settings = _json_loads(f.read())
                 # Ensure all default keys exist
                 for key, value in default_settings.items():
                     if key not in self.settings:
@@ -111,11 +279,18 @@ class CodeEditor:
         
         self.current_theme = self.settings.get('theme', 'dark')
     
+    def _refresh_cached_style(self):
+        """Cache the active theme dict and editor font tuple"""
+        self._theme = self.themes[self.current_theme]
+        self._font = (self.settings['font_family'], self.settings['font_size'])
+        # Theme colours happen to be keyed by the highlight tag names
+        self._tag_specs = {tag: {'foreground': self._theme[tag]} for tag in _HIGHLIGHT_TAGS}
+    
     def save_settings(self):
         """Save settings to config file"""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.settings, f, indent=4)
+            with open(self.config_file, 'wb') as f:
+                f.write(_json_dumps(self.settings))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save settings: {str(e)}")
         
@@ -130,6 +305,9 @@ class CodeEditor:
         # Set minimum dimensions
         self.root.minsize(800, 600)
         
+        # Closing the window finishes pending saves like File > Exit does
+        self.root.protocol("WM_DELETE_WINDOW", self.file_exit)
+        
         # Configure grid layout
         self.root.grid_rowconfigure(0, weight=1)
         self.root.grid_columnconfigure(0, weight=1)
@@ -211,7 +389,7 @@ class CodeEditor:
     
     def create_toolbar(self):
         """Create the toolbar"""
-        theme = self.themes[self.current_theme]
+        theme = self._theme
         self.toolbar = tk.Frame(self.root, bg=theme['toolbar_bg'], height=40)
         self.toolbar.pack(side=tk.TOP, fill=tk.X)
         
@@ -277,7 +455,7 @@ class CodeEditor:
     
     def create_terminal(self):
         """Create the integrated terminal"""
-        theme = self.themes[self.current_theme]
+        theme = self._theme
         
         # Terminal title bar
         terminal_title = tk.Frame(self.terminal_container, bg=theme['toolbar_bg'], height=25)
@@ -317,6 +495,9 @@ class CodeEditor:
         """Append text to terminal output"""
         self.terminal_output.config(state='normal')
         self.terminal_output.insert(tk.END, text)
+        lines = int(self.terminal_output.index('end-1c').split('.')[0])
+        if lines > MAX_TERM_LINES:
+            self.terminal_output.delete("1.0", f"{lines - MAX_TERM_LINES + 1}.0")
         self.terminal_output.see(tk.END)
         self.terminal_output.config(state='disabled')
     
@@ -346,7 +527,7 @@ class CodeEditor:
         style.map("Treeview", background=[("selected", "#094771")])
         
         # Treeview widget
-        self.file_tree = ttk.Treeview(tree_frame, yscrollcommand=lambda *args: scrollbar.set(*args))
+        self.file_tree = ttk.Treeview(tree_frame, yscrollcommand=lambda *args: self._on_tree_scroll(scrollbar, *args))
         self.file_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         # Scrollbar
@@ -359,6 +540,8 @@ class CodeEditor:
         # Bind events
         self.file_tree.bind("<<TreeviewOpen>>", self.on_folder_expand)
         self.file_tree.bind("<Double-1>", self.on_file_double_click)
+        self.file_tree.bind("<Configure>", lambda e: self._schedule_extend_window(), add='+')
+        self.file_tree.tag_bind("more", "<Button-1>", self.on_more_click)
         
         # Populate with current directory
         self.populate_tree()
@@ -370,38 +553,187 @@ class CodeEditor:
             # Clear existing items
             for item in self.file_tree.get_children():
                 self.file_tree.delete(item)
+            self._node_children.clear()
+            self._more_rows.clear()
+            self._dummy_child.clear()
+            self._tree_nodes.clear()
+            self._tree_items.clear()
             # Add root
             node = self.file_tree.insert("", "end", text=path, values=[path], open=True)
+            self._tree_nodes[path] = node
+            self._tree_items[node] = (path, True)
             parent = node
         
+        # Use the startup scan if it already finished; it is only fresh enough
+        # for the first population, so close the cache either way
+        with self._scan_cache_lock:
+            entries = self._scan_cache.pop(path, None)
+            self._scan_cache.clear()
+            self._prewarm_open = False
+        if entries is not None:
+            self._apply_tree_nodes(parent, path, entries)
+            return
+        
+        # Read the directory off the UI thread; slow or network drives
+        # would otherwise freeze the editor while the folder expands
+        threading.Thread(target=self._scan_worker, args=(parent, path), daemon=True).start()
+    
+    def _prewarm_cwd(self):
+        """Scan the working directory ahead of the first populate_tree"""
+        path = os.getcwd()
+        entries = self._scan_dir(path)
+        with self._scan_cache_lock:
+            # Too late if populate_tree already ran its own scan
+            if entries is not None and self._prewarm_open:
+                self._scan_cache[path] = entries
+    
+    def _scan_dir(self, path):
+        """Return sorted (name, is_dir, path) entries, or None if unreadable"""
         try:
-            items = os.listdir(path)
-            # Sort: directories first, then files
-            items.sort(key=lambda x: (not os.path.isdir(os.path.join(path, x)), x.lower()))
-            
-            for item in items:
-                item_path = os.path.join(path, item)
-                if os.path.isdir(item_path):
-                    # Add folder with dummy child to make it expandable
-                    node = self.file_tree.insert(parent, "end", text=f"📁 {item}", 
-                                                 values=[item_path])
-                    self.file_tree.insert(node, "end", text="dummy")  # Dummy child
-                else:
-                    # Add file
-                    self.file_tree.insert(parent, "end", text=f"📄 {item}", 
-                                         values=[item_path])
+            with os.scandir(path) as it:
+                entries = [(e.name, e.is_dir(follow_symlinks=False), e.path) for e in it]
         except PermissionError:
-            pass
+            return None
+        # Sort: directories first, then files
+        entries.sort(key=lambda t: (not t[1], t[0].lower()))
+        return entries
+    
+    def _scan_worker(self, parent, path, apply=None):
+        """Scan a directory in the background and post the entries to the UI thread"""
+        entries = self._scan_dir(path)
+        if entries is not None:
+            self.root.after(0, apply or self._apply_tree_nodes, parent, path, entries)
+    
+    def _apply_tree_nodes(self, parent, path, entries):
+        """Insert scanned entries under a tree node (runs on the Tk thread)"""
+        if not self.file_tree.exists(parent):
+            return  # Tree was refreshed while the scan was running
+        if self.file_tree.get_children(parent):
+            # A refresh filled this folder while the scan was running
+            self._sync_tree_nodes(parent, path, entries)
+            return
+        
+        # Keep the full listing in Python and only insert a window of rows;
+        # Treeview cost grows with every row, so huge folders stay responsive
+        self._node_children[parent] = [entries, 0]
+        self._insert_tree_window(parent)
+    
+    def _insert_tree_window(self, parent):
+        """Insert the next window of rows for a folder plus a "more" sentinel"""
+        entries, start = self._node_children[parent]
+        end = min(start + self._tree_window, len(entries))
+        for item, is_dir, item_path in entries[start:end]:
+            self._insert_tree_row(parent, "end", item, is_dir, item_path)
+        
+        remaining = len(entries) - end
+        if remaining:
+            self._node_children[parent][1] = end
+            more = self.file_tree.insert(parent, "end", text=f"… {remaining} more",
+                                         tags=("more",))
+            self._more_rows[more] = parent
+        else:
+            del self._node_children[parent]
+    
+    def _insert_tree_row(self, parent, index, item, is_dir, item_path):
+        """Insert one file or folder row and record it in the path maps"""
+        if is_dir:
+            # Add folder with dummy child to make it expandable
+            node = self.file_tree.insert(parent, index, text=f"📁 {item}", 
+                                         values=[item_path])
+            self._dummy_child[node] = self.file_tree.insert(node, "end", text="dummy")  # Dummy child
+        else:
+            # Add file
+            node = self.file_tree.insert(parent, index, text=f"📄 {item}", 
+                                         values=[item_path])
+        self._tree_nodes[item_path] = node
+        self._tree_items[node] = (item_path, is_dir)
+    
+    def _delete_tree_item(self, item):
+        """Delete a row and drop it and its descendants from the tree maps"""
+        stack = [item]
+        while stack:
+            node = stack.pop()
+            stack.extend(self.file_tree.get_children(node))
+            info = self._tree_items.pop(node, None)
+            if info:
+                self._tree_nodes.pop(info[0], None)
+            self._dummy_child.pop(node, None)
+            self._node_children.pop(node, None)
+            self._more_rows.pop(node, None)
+        self.file_tree.delete(item)
+    
+    def _sync_tree_nodes(self, parent, path, entries):
+        """Bring a shown folder in line with a fresh scan, keeping unchanged rows"""
+        if not self.file_tree.exists(parent):
+            return
+        
+        children = self.file_tree.get_children(parent)
+        if parent in self._node_children or len(entries) > self._tree_window:
+            # Windowed folders are simply reloaded
+            for child in children:
+                self._delete_tree_item(child)
+            self._node_children[parent] = [entries, 0]
+            self._insert_tree_window(parent)
+            return
+        
+        # Drop rows that vanished or changed between file and folder
+        wanted = {item_path: is_dir for _, is_dir, item_path in entries}
+        for child in children:
+            item_path, is_dir = self._tree_items.get(child, (None, None))
+            if wanted.get(item_path) != is_dir:
+                self._delete_tree_item(child)
+        
+        # Insert new rows; kept rows are already in sorted order
+        for index, (item, is_dir, item_path) in enumerate(entries):
+            if item_path not in self._tree_nodes:
+                self._insert_tree_row(parent, index, item, is_dir, item_path)
+    
+    def _extend_window(self, more):
+        """Replace a "more" sentinel with the next window of rows"""
+        parent = self._more_rows.pop(more, None)
+        if parent is None or parent not in self._node_children:
+            return
+        self.file_tree.delete(more)
+        self._insert_tree_window(parent)
+    
+    def on_more_click(self, event):
+        """Load the next window of rows when a "more" row is clicked"""
+        item = self.file_tree.identify_row(event.y)
+        if item in self._more_rows:
+            self._extend_window(item)
+            return "break"
+    
+    def _on_tree_scroll(self, scrollbar, first, last):
+        """Keep the scrollbar in sync and extend windows scrolled into view"""
+        scrollbar.set(first, last)
+        if self._more_rows:
+            self._schedule_extend_window()
+    
+    def _schedule_extend_window(self):
+        """Coalesce scroll events into one window check per idle cycle"""
+        if not self._extend_pending:
+            self._extend_pending = True
+            self.root.after_idle(self._maybe_extend_window)
+    
+    def _maybe_extend_window(self):
+        """Extend any folder whose "more" sentinel has scrolled into view"""
+        self._extend_pending = False
+        for more in list(self._more_rows):
+            if not self.file_tree.exists(more):
+                self._more_rows.pop(more, None)
+            elif self.file_tree.bbox(more):
+                # bbox is empty for rows outside the viewport or collapsed
+                self._extend_window(more)
     
     def on_folder_expand(self, event):
         """Handle folder expansion"""
         item = self.file_tree.focus()
-        children = self.file_tree.get_children(item)
         
-        # If only has dummy child, populate it
-        if len(children) == 1 and self.file_tree.item(children[0])["text"] == "dummy":
-            self.file_tree.delete(children[0])
-            path = self.file_tree.item(item)["values"][0]
+        # If it still has its dummy child, populate it
+        dummy = self._dummy_child.pop(item, None)
+        if dummy:
+            self.file_tree.delete(dummy)
+            path = self.file_tree.item(item, "values")[0]
             self.populate_tree(item, path)
     
     def on_file_double_click(self, event):
@@ -485,10 +817,9 @@ class CodeEditor:
                 self.refresh_tree()
                 
                 # Update open tabs if file was renamed
-                for tab_info in self.open_tabs.values():
-                    if tab_info['file_path'] == old_path:
-                        tab_info['file_path'] = new_path
-                        tab_info['title'] = new_name
+                tab_id = self._path_to_tabid.get(self._path_key(old_path))
+                if tab_id:
+                    self.set_tab_path(tab_id, new_path)
                 
                 messagebox.showinfo("Success", f"Renamed to: {new_name}")
             except Exception as e:
@@ -512,24 +843,39 @@ class CodeEditor:
                 self.refresh_tree()
                 
                 # Close tabs for deleted files
-                tabs_to_close = []
-                for tab_id, tab_info in self.open_tabs.items():
-                    if tab_info['file_path'] == path:
-                        tabs_to_close.append(tab_id)
-                
-                for tab_id in tabs_to_close:
-                    for i, tab in enumerate(self.notebook.tabs()):
-                        if str(self.notebook.nametowidget(tab)) == tab_id:
-                            self.close_tab(i)
-                            break
+                tab_id = self._path_to_tabid.get(self._path_key(path))
+                if tab_id:
+                    self.close_tab(self.notebook.index(self.open_tabs[tab_id].tab_frame))
                 
                 messagebox.showinfo("Success", f"Deleted: {name}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete: {str(e)}")
     
     def refresh_tree(self):
-        """Refresh the file tree"""
-        self.populate_tree()
+        """Refresh the file tree, rescanning only folders that are shown"""
+        root_items = self.file_tree.get_children()
+        if not root_items:
+            self.populate_tree()
+            return
+        
+        stack = [root_items[0]]
+        while stack:
+            folder = stack.pop()
+            if folder in self._dummy_child:
+                continue  # Never expanded, will be scanned when opened
+            path = self._tree_items[folder][0]
+            if folder != root_items[0] and not self.file_tree.item(folder, "open"):
+                # Collapsed: forget its contents so the next expand rescans
+                for child in self.file_tree.get_children(folder):
+                    self._delete_tree_item(child)
+                self._node_children.pop(folder, None)
+                self._dummy_child[folder] = self.file_tree.insert(folder, "end", text="dummy")
+                continue
+            
+            threading.Thread(target=self._scan_worker, args=(folder, path, self._sync_tree_nodes),
+                             daemon=True).start()
+            stack.extend(child for child in self.file_tree.get_children(folder)
+                         if self._tree_items.get(child, (None, False))[1])
     
     def create_notebook(self):
         """Create the tabbed notebook for editor"""
@@ -539,6 +885,7 @@ class CodeEditor:
         # Bind tab close events
         self.notebook.bind("<Button-3>", self.on_tab_right_click)
         self.notebook.bind("<Button-2>", self.on_tab_middle_click)  # Middle-click to close
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
     
     def on_tab_middle_click(self, event):
         """Handle middle-click on tab to close"""
@@ -550,8 +897,8 @@ class CodeEditor:
     
     def create_editor_tab(self, title="Untitled", content="", file_path=None):
         """Create a new editor tab with text widget and line numbers"""
-        theme = self.themes[self.current_theme]
-        font = (self.settings['font_family'], self.settings['font_size'])
+        theme = self._theme
+        font = self._font
         
         # Create frame for this tab
         tab_frame = tk.Frame(self.notebook, bg=theme['bg'])
@@ -560,11 +907,9 @@ class CodeEditor:
         editor_frame = tk.Frame(tab_frame, bg=theme['bg'])
         editor_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Line numbers widget
-        line_numbers = tk.Text(editor_frame, width=4, padx=5, pady=5,
-                               bg=theme['line_num_bg'], fg=theme['line_num_fg'], 
-                               font=font, state='disabled',
-                               takefocus=0, bd=0, highlightthickness=0)
+        # Line numbers gutter (a canvas that only draws the visible numbers)
+        line_numbers = tk.Canvas(editor_frame, width=40, bg=theme['line_num_bg'],
+                                 takefocus=0, bd=0, highlightthickness=0)
         line_numbers.pack(side=tk.LEFT, fill=tk.Y)
         
         # Create text widget with scrollbars
@@ -585,28 +930,33 @@ class CodeEditor:
                              bg=theme['bg'], fg=theme['fg'],
                              insertbackground=theme['insert_bg'],
                              font=font,
-                             yscrollcommand=v_scrollbar.set,
+                             yscrollcommand=lambda *args: self.on_text_yscroll(text_widget, line_numbers, v_scrollbar, *args),
                              xscrollcommand=h_scrollbar.set,
                              selectbackground=theme['select_bg'],
                              bd=0, padx=5, pady=5)
         text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        v_scrollbar.config(command=self.on_scroll(text_widget, line_numbers))
+        v_scrollbar.config(command=self.on_scroll(text_widget))
+        self._install_edit_proxy(text_widget)
         h_scrollbar.config(command=text_widget.xview)
         
-        # Configure syntax highlighting tags
-        self.configure_syntax_tags(text_widget)
+        line_numbers.bind("<Configure>", lambda e: self.redraw_line_numbers(text_widget, line_numbers))
         
-        # Insert content
-        text_widget.insert("1.0", content)
+        # Wheel over the gutter scrolls the editor; the gutter follows via yscrollcommand
+        line_numbers.bind("<MouseWheel>", lambda e: self.on_gutter_wheel(text_widget, -1 if e.delta > 0 else 1))
+        line_numbers.bind("<Button-4>", lambda e: self.on_gutter_wheel(text_widget, -1))
+        line_numbers.bind("<Button-5>", lambda e: self.on_gutter_wheel(text_widget, 1))
         
         # Bind events for line numbers and syntax highlighting
-        text_widget.bind("<<Modified>>", lambda e: self.on_text_modified(text_widget, line_numbers))
-        text_widget.bind("<KeyRelease>", lambda e: self.apply_syntax_highlighting(text_widget))
+        text_widget.bind("<<Modified>>", lambda e: self.on_text_modified(text_widget))
+        
+        # Highlighting only covers the visible lines; view moves are caught in
+        # on_text_yscroll, resizes that don't move the view here
+        text_widget.bind("<Configure>", lambda e: self.schedule_highlight(text_widget, delay=50), add='+')
         
         # Bind cursor movement events for status bar
-        text_widget.bind("<KeyRelease>", lambda e: self.update_status_bar(text_widget), add='+')
-        text_widget.bind("<ButtonRelease-1>", lambda e: self.update_status_bar(text_widget))
+        text_widget.bind("<KeyRelease>", lambda e: self.schedule_status_update(text_widget), add='+')
+        text_widget.bind("<ButtonRelease-1>", lambda e: self.schedule_status_update(text_widget))
         
         # AI code completion bindings
         text_widget.bind("<KeyRelease>", lambda e: self.on_key_release_for_ai(e, text_widget), add='+')
@@ -624,112 +974,319 @@ class CodeEditor:
         
         # Add tab to notebook
         self.notebook.add(tab_frame, text=title)
-        self.notebook.select(tab_frame)
+        self._select_tab(tab_frame)
         
         # Store tab info
         tab_id = str(tab_frame)
-        self.open_tabs[tab_id] = {
-            'text_widget': text_widget,
-            'line_numbers': line_numbers,
-            'file_path': file_path,
-            'title': title,
-            'modified': False
-        }
+        self.open_tabs[tab_id] = _TabInfo(text_widget, line_numbers, tab_frame, file_path, title)
+        self._tabid_by_widget[text_widget] = tab_id
+        self._tab_order.append(tab_id)
+        if file_path:
+            self._path_to_tabid[self._path_key(file_path)] = tab_id
         
-        # Update line numbers initially
-        self.update_line_numbers(text_widget, line_numbers)
-        self.apply_syntax_highlighting(text_widget)
+        # Show the empty tab first; content, tags and the first paint follow
+        # once Tk is idle so opening a tab never blocks on them
+        if content:
+            self.open_tabs[tab_id].loading = True
+            for i in range(0, len(content), 65536):
+                self.root.after_idle(self._append_chunk, text_widget, content[i:i + 65536])
+            self.root.after_idle(self._finish_load, text_widget)
+        self.root.after(0, self._init_tab_view, text_widget)
         
         return tab_frame
     
-    def on_scroll(self, text_widget, line_numbers):
-        """Synchronize scrolling between text widget and line numbers"""
+    def _init_tab_view(self, text_widget):
+        """Configure tags and draw line numbers/highlighting for a new tab"""
+        tab_info = self.get_tab_info_for_widget(text_widget)
+        if not tab_info:
+            return  # Tab was closed straight away
+        self.configure_syntax_tags(text_widget)
+        # Find/replace match highlight, kept above the syntax colours
+        text_widget.tag_configure("search", background="yellow", foreground="black")
+        text_widget.tag_raise("search")
+        self.update_line_numbers(text_widget, tab_info.line_numbers)
+        if not tab_info.loading:
+            self.apply_syntax_highlighting(text_widget)
+    
+    def on_scroll(self, text_widget):
+        """Scroll the text widget from its scrollbar"""
         def scroll(*args):
             text_widget.yview(*args)
-            line_numbers.yview(*args)
         return scroll
     
-    def on_text_modified(self, text_widget, line_numbers):
-        """Handle text modifications"""
-        if text_widget.edit_modified():
-            self.update_line_numbers(text_widget, line_numbers)
-            self.mark_tab_modified(text_widget)
+    def _install_edit_proxy(self, text_widget):
+        """Route the widget's Tcl command through Python to see every edit"""
+        widget = str(text_widget)
+        orig = widget + "_orig"
+        tk_call = text_widget.tk.call
+        tk_call("rename", widget, orig)
+        
+        def proxy(*args):
+            if args and args[0] in ("insert", "delete", "replace"):
+                self._note_dirty_lines(text_widget, orig, args)
+            # A TclError raised out of a createcommand callback skips Tcl's
+            # catch and kills mainloop (e.g. copy with no selection), so
+            # swallow it like idlelib's WidgetRedirector does
+            try:
+                return tk_call((orig,) + args)
+            except tk.TclError:
+                return ""
+        
+        text_widget.tk.createcommand(widget, proxy)
+        # Let tkinter delete the proxy command when the widget is destroyed
+        if text_widget._tclCommands is None:
+            text_widget._tclCommands = []
+        text_widget._tclCommands.append(widget)
+    
+    def _get_selection(self, text_widget):
+        """Selected text; raises TclError when nothing is selected"""
+        # The edit proxy turns Tcl errors into "", so check the sel tag
+        # explicitly instead of relying on get(SEL_FIRST, SEL_LAST) raising
+        if not text_widget.tag_ranges(tk.SEL):
+            raise tk.TclError("no text selected")
+        return text_widget.get(tk.SEL_FIRST, tk.SEL_LAST)
+    
+    def _note_dirty_lines(self, text_widget, orig, args):
+        """Record the lines an insert/delete/replace is about to touch"""
+        tab_info = self.get_tab_info_for_widget(text_widget)
+        if not tab_info or tab_info.loading:
+            return  # Highlighting catches up once loading finishes
+        try:
+            line = int(str(text_widget.tk.call(orig, "index", args[1])).split('.')[0])
+        except tk.TclError:
+            return  # Bad index; the edit itself will raise
+        
+        # insert: index chars ?tags chars ...?  replace: i1 i2 chars ?tags ...?
+        if args[0] == "insert":
+            new_text = args[2::2]
+        elif args[0] == "replace":
+            new_text = args[3::2]
+        else:
+            new_text = ()
+        added = sum(str(chars).count("\n") for chars in new_text)
+        tab_info.dirty_lines.update(range(line, line + added + 1))
+        tab_info.hl_version += 1  # Highlight results computed on the old text are stale
+    
+    def on_gutter_wheel(self, text_widget, direction):
+        """Scroll the editor when the wheel is used over the line numbers"""
+        text_widget.yview_scroll(direction * 3, "units")
+        self.schedule_highlight(text_widget, delay=50)
+        return "break"
+    
+    def on_text_yscroll(self, text_widget, line_numbers, scrollbar, first, last):
+        """Keep the scrollbar and line-number gutter in step with the text view"""
+        scrollbar.set(first, last)
+        self.redraw_line_numbers(text_widget, line_numbers)
+        # Every view change lands here: wheel, keys, see(), drag-select autoscroll
+        self.schedule_highlight(text_widget, delay=50)
+    
+    def on_text_modified(self, text_widget):
+        """Queue one edit pass per idle cycle however many edits fire"""
+        if not text_widget.edit_modified():
+            return  # Fired by edit_modified(False) re-arming the flag
+        tab_info = self.get_tab_info_for_widget(text_widget)
+        if tab_info and not tab_info.edit_pending:
+            tab_info.edit_pending = True
+            self.root.after_idle(self._process_edit, text_widget)
+    
+    def _process_edit(self, text_widget):
+        """Update the tab after edits: modified marker, line numbers, highlighting"""
+        tab_info = self.get_tab_info_for_widget(text_widget)
+        if not tab_info:
+            return  # Tab was closed
+        tab_info.edit_pending = False
+        
+        if tab_info.loading:
+            # Bulk insert from open_file; _finish_load catches up afterwards
             text_widget.edit_modified(False)
+            return
+        
+        tab_info.hl_view = None
+        
+        # mark_tab_modified only does work on the first edit after a save
+        self.mark_tab_modified(text_widget)
+        tab_id = self._tabid_by_widget[text_widget]
+        self._debounce(('ln', tab_id), 30,
+                       lambda: self.update_line_numbers(text_widget, tab_info.line_numbers))
+        self.schedule_highlight(text_widget)
+        
+        # Re-arm <<Modified>> for the next edit
+        text_widget.edit_modified(False)
+    
+    def get_tab_info_for_widget(self, text_widget):
+        """Get tab info for the tab owning a text widget"""
+        tab_id = self._tabid_by_widget.get(text_widget)
+        return self.open_tabs.get(tab_id) if tab_id else None
+    
+    def schedule_highlight(self, text_widget, delay=200):
+        """Re-highlight once typing pauses instead of on every keystroke"""
+        tab_id = self._tabid_by_widget.get(text_widget)
+        if not tab_id or self.open_tabs[tab_id].loading:
+            return
+        self._debounce(('hl', tab_id), delay, lambda: self.apply_syntax_highlighting(text_widget))
+    
+    def _debounce(self, key, ms, fn):
+        """Run fn once, ms after the most recent call with the same key"""
+        after_id = self._debouncers.get(key)
+        if after_id:
+            self.root.after_cancel(after_id)
+        
+        def run():
+            del self._debouncers[key]
+            fn()
+        self._debouncers[key] = self.root.after(ms, run)
+    
+    def _cancel_debounce(self, key):
+        """Drop a pending debounced call, if any"""
+        after_id = self._debouncers.pop(key, None)
+        if after_id:
+            self.root.after_cancel(after_id)
     
     def update_line_numbers(self, text_widget, line_numbers):
         """Update line numbers display"""
-        line_numbers.config(state='normal')
-        line_numbers.delete("1.0", tk.END)
-        
         # Get number of lines
         line_count = int(text_widget.index('end-1c').split('.')[0])
         
-        # Generate line numbers
-        line_nums = "\n".join(str(i) for i in range(1, line_count + 1))
-        line_numbers.insert("1.0", line_nums)
+        # Most edits don't change the line count; scrolling redraws on its own
+        tab_info = self.get_tab_info_for_widget(text_widget)
+        if tab_info:
+            if line_count == tab_info.line_count:
+                return
+            tab_info.line_count = line_count
+        
+        # Widen the gutter to fit the largest line number
+        font = self._font
+        width = int(line_numbers.tk.call('font', 'measure', font, '0' * len(str(line_count)))) + 14
+        if width != int(line_numbers.cget('width')):
+            line_numbers.config(width=max(width, 40))
         
-        line_numbers.config(state='disabled')
+        self.redraw_line_numbers(text_widget, line_numbers)
+    
+    def redraw_line_numbers(self, text_widget, line_numbers):
+        """Draw the numbers of the lines currently on screen"""
+        theme = self._theme
+        font = self._font
+        x = int(line_numbers.cget('width')) - 6
+        
+        line_numbers.delete('all')
+        first, last = self.get_visible_line_range(text_widget, margin=0)
+        for ln in range(first, last + 1):
+            dline = text_widget.dlineinfo(f"{ln}.0")
+            if dline is None:
+                continue  # Off screen or past the end of the buffer
+            line_numbers.create_text(x, dline[1], text=str(ln), anchor='ne',
+                                     fill=theme['line_num_fg'], font=font)
     
     def configure_syntax_tags(self, text_widget):
         """Configure syntax highlighting tags"""
-        theme = self.themes[self.current_theme]
-        text_widget.tag_configure("keyword", foreground=theme['keyword'])
-        text_widget.tag_configure("string", foreground=theme['string'])
-        text_widget.tag_configure("comment", foreground=theme['comment'])
-        text_widget.tag_configure("number", foreground=theme['number'])
-        text_widget.tag_configure("function", foreground=theme['function'])
+        for tag, spec in self._tag_specs.items():
+            text_widget.tag_configure(tag, **spec)
+    
+    def get_visible_line_range(self, text_widget, margin=5):
+        """Get (first, last) line numbers currently in view, padded by margin"""
+        first = int(text_widget.index("@0,0").split('.')[0])
+        last = int(text_widget.index(f"@0,{text_widget.winfo_height()}").split('.')[0])
+        return max(1, first - margin), last + margin
     
     def apply_syntax_highlighting(self, text_widget):
-        """Apply syntax highlighting for Python"""
-        # Remove existing tags
-        for tag in ["keyword", "string", "comment", "number", "function"]:
-            text_widget.tag_remove(tag, "1.0", tk.END)
-        
-        content = text_widget.get("1.0", tk.END)
-        
-        # Highlight comments
-        for match in re.finditer(r'#.*$', content, re.MULTILINE):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            text_widget.tag_add("comment", start, end)
-        
-        # Highlight strings (single and double quotes)
-        for match in re.finditer(r'(["\'])(?:(?=(\\?))\2.)*?\1', content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            text_widget.tag_add("string", start, end)
-        
-        # Highlight keywords
-        keywords = r'\b(def|class|if|elif|else|for|while|return|import|from|as|try|except|finally|with|lambda|yield|pass|break|continue|and|or|not|in|is|None|True|False)\b'
-        for match in re.finditer(keywords, content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            text_widget.tag_add("keyword", start, end)
-        
-        # Highlight numbers
-        for match in re.finditer(r'\b\d+\.?\d*\b', content):
-            start = f"1.0+{match.start()}c"
-            end = f"1.0+{match.end()}c"
-            text_widget.tag_add("number", start, end)
-        
-        # Highlight function definitions
-        for match in re.finditer(r'\bdef\s+(\w+)', content):
-            start = f"1.0+{match.start(1)}c"
-            end = f"1.0+{match.end(1)}c"
-            text_widget.tag_add("function", start, end)
+        """Apply syntax highlighting for Python to the visible lines"""
+        first, last = self.get_visible_line_range(text_widget)
+        
+        # Scroll/resize events often leave the view where it was
+        tab_info = self.get_tab_info_for_widget(text_widget)
+        if tab_info:
+            if tab_info.hl_view == (first, last):
+                return
+            tab_info.hl_view = (first, last)
+        
+        self._highlight_lines(text_widget, first, last)
+    
+    def _highlight_lines(self, text_widget, first, last):
+        """Re-tokenize lines in [first, last] whose text changed since last pass"""
+        tab_info = self.get_tab_info_for_widget(text_widget)
+        if not tab_info:
+            return
+        last = min(last, int(text_widget.index('end-1c').split('.')[0]))
+        
+        # One get() for the whole range instead of one per line
+        lines = text_widget.get(f"{first}.0", f"{last}.end").split("\n")
+        todo = []
+        for ln, line in enumerate(lines, first):
+            h = hash(line)
+            if ln not in tab_info.dirty_lines and tab_info.line_hash.get(ln) == h:
+                continue
+            todo.append((ln, line, h))
+        
+        if not todo:
+            tab_info.dirty_lines.difference_update(range(first, last + 1))
+            return
+        
+        # Tokenize on the worker thread; only the tag calls run on the Tk thread
+        tab_info.hl_version += 1
+        version = tab_info.hl_version
+        future = self._hl_executor.submit(self._tokenize_lines, todo)
+        future.add_done_callback(lambda f: self.root.after(
+            0, self._apply_highlight, text_widget, version, first, last, todo, f))
+    
+    def _tokenize_lines(self, todo):
+        """Collect tag ranges for (line number, text, hash) entries (worker thread)"""
+        # Collect index pairs per tag so each tag costs one Tcl call
+        stale = []
+        ranges = {tag: [] for tag in _HIGHLIGHT_TAGS}
+        for ln, line, _ in todo:
+            stale += (f"{ln}.0", f"{ln}.end")
+            self._highlight_line(ln, line, ranges)
+        return stale, ranges
+    
+    def _apply_highlight(self, text_widget, version, first, last, todo, future):
+        """Apply a finished tokenize pass unless the text changed meanwhile"""
+        tab_info = self.get_tab_info_for_widget(text_widget)
+        if not tab_info or tab_info.hl_version != version:
+            return  # Tab closed, edited or re-highlighted since the pass started
+        stale, ranges = future.result()
+        
+        # Remove existing tags, then apply the new ones
+        for tag, spans in ranges.items():
+            text_widget.tag_remove(tag, *stale)
+            if spans:
+                text_widget.tag_add(tag, *spans)
+        
+        for ln, _, h in todo:
+            tab_info.line_hash[ln] = h
+        tab_info.dirty_lines.difference_update(range(first, last + 1))
+    
+    def _highlight_line(self, ln, content, ranges):
+        """Collect tag ranges for one line of Python source"""
+        # content is a single line, so match offsets are already column
+        # numbers and "line.col" indices need no Tcl-side char counting
+        stripped = content.lstrip()
+        if stripped.startswith("#"):
+            # Whole-line comment: no tokenizing needed
+            ranges["comment"] += (f"{ln}.{len(content) - len(stripped)}", f"{ln}.{len(content)}")
+            return
+        
+        for match in _RE_TOKEN.finditer(content):
+            tag = match.lastgroup
+            if tag == "funcdef":
+                # "def" keyword, then the function name at the end of the match
+                start, end = match.start(), match.end()
+                name_start = end - len(match.group().split()[-1])
+                ranges["keyword"] += (f"{ln}.{start}", f"{ln}.{start + 3}")
+                ranges["function"] += (f"{ln}.{name_start}", f"{ln}.{end}")
+                continue
+            if tag == "name":
+                if match.group() not in KEYWORDS:
+                    continue
+                tag = "keyword"
+            ranges[tag] += (f"{ln}.{match.start()}", f"{ln}.{match.end()}")
     
     def mark_tab_modified(self, text_widget):
         """Mark tab as modified"""
-        for tab_id, tab_info in self.open_tabs.items():
-            if tab_info['text_widget'] == text_widget and not tab_info['modified']:
-                tab_info['modified'] = True
-                # Find tab index
-                for i in range(self.notebook.index('end')):
-                    if str(self.notebook.nametowidget(self.notebook.tabs()[i])) == tab_id:
-                        current_title = self.notebook.tab(i, 'text')
-                        if not current_title.startswith('• '):
-                            self.notebook.tab(i, text='• ' + current_title)
-                        break
+        tab_id = self._tabid_by_widget.get(text_widget)
+        tab_info = self.open_tabs.get(tab_id)
+        if tab_info and not tab_info.modified:
+            tab_info.modified = True
+            self.notebook.tab(tab_info.tab_frame, text=MODIFIED_PREFIX + tab_info.title)
     
     def on_tab_right_click(self, event):
         """Handle right-click on tab to close"""
@@ -742,119 +1299,255 @@ class CodeEditor:
     def close_tab(self, tab_index):
         """Close a tab"""
         if self.notebook.index('end') > 0:
-            tab_id = str(self.notebook.nametowidget(self.notebook.tabs()[tab_index]))
+            tab_id = self._tab_order[tab_index]
             if tab_id in self.open_tabs:
                 # Check if modified
-                if self.open_tabs[tab_id]['modified']:
+                if self.open_tabs[tab_id].modified:
                     response = messagebox.askyesnocancel(
                         "Unsaved Changes",
-                        f"Save changes to {self.open_tabs[tab_id]['title']}?"
+                        f"Save changes to {self.open_tabs[tab_id].title}?"
                     )
                     if response is True:  # Yes
                         self.save_current_tab()
                     elif response is None:  # Cancel
                         return
                 
-                del self.open_tabs[tab_id]
+                tab_info = self.open_tabs.pop(tab_id)
+                self._tabid_by_widget.pop(tab_info.text_widget, None)
+                self._path_to_tabid.pop(self._path_key(tab_info.file_path), None)
+                self._cancel_debounce(('hl', tab_id))
+                self._cancel_debounce(('ln', tab_id))
+                self._cancel_debounce(('save', tab_id))
             
+            del self._tab_order[tab_index]
+            # forget() may select another tab before <<NotebookTabChanged>> arrives
+            self._current_tab_info_cache = None
             self.notebook.forget(tab_index)
     
+    def _path_key(self, file_path):
+        """Normalize a path so the same file always maps to one tab"""
+        if not file_path:
+            return None
+        return os.path.normcase(os.path.abspath(file_path))
+    
+    def set_tab_path(self, tab_id, file_path):
+        """Point a tab at a new file path and title"""
+        tab_info = self.open_tabs[tab_id]
+        self._path_to_tabid.pop(self._path_key(tab_info.file_path), None)
+        self._path_to_tabid[self._path_key(file_path)] = tab_id
+        tab_info.file_path = file_path
+        tab_info.title = os.path.basename(file_path)
+    
+    def _select_tab(self, tab_frame):
+        """Select a tab; <<NotebookTabChanged>> arrives later, so drop the cache now"""
+        self._current_tab_info_cache = None
+        self.notebook.select(tab_frame)
+    
+    def on_tab_changed(self, event=None):
+        """Refresh per-tab state when a different tab is selected"""
+        self._current_tab_info_cache = None
+        tab_info = self.get_current_tab_info()
+        if not tab_info:
+            return
+        if tab_info.stale_theme:
+            self._restyle_tab(tab_info)
+        # Files that finished loading while hidden get their first highlight now
+        if tab_info.hl_view is None:
+            self.schedule_highlight(tab_info.text_widget, delay=0)
+    
     def get_current_tab_info(self):
         """Get info for currently selected tab"""
+        if self._current_tab_info_cache is not None:
+            return self._current_tab_info_cache
         try:
+            # select() already returns the tab frame's path, i.e. its tab id
             current_tab = self.notebook.select()
             if current_tab:
-                tab_id = str(self.notebook.nametowidget(current_tab))
-                return self.open_tabs.get(tab_id)
+                self._current_tab_info_cache = self.open_tabs.get(str(current_tab))
+                return self._current_tab_info_cache
         except:
             pass
         return None
     
-    def save_current_tab(self):
+    def save_current_tab(self, then=None):
         """Save the current tab"""
         tab_info = self.get_current_tab_info()
         if tab_info:
-            text_widget = tab_info['text_widget']
-            
-            # Clear any ghost text before saving
-            self.clear_ai_suggestion(text_widget)
-            
-            file_path = tab_info['file_path']
-            
-            if file_path:
-                # Save to existing path
-                try:
-                    content = text_widget.get("1.0", "end-1c")
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
-                    tab_info['modified'] = False
-                    # Remove modified indicator
-                    for i in range(self.notebook.index('end')):
-                        if str(self.notebook.nametowidget(self.notebook.tabs()[i])) == str(self.notebook.select()):
-                            title = self.notebook.tab(i, 'text').replace('• ', '')
-                            self.notebook.tab(i, text=title)
-                            break
-                    messagebox.showinfo("Success", "File saved successfully!")
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to save file: {str(e)}")
-            else:
-                # New file, prompt for location
-                self.save_as_current_tab()
+            self.save_tab(tab_info, then)
     
-    def save_as_current_tab(self):
+    def save_tab(self, tab_info, then=None):
+        """Save a tab to its file, asking for a name if it has none"""
+        if tab_info.text_widget not in self._tabid_by_widget:
+            return  # Closed before a debounced save fired
+        
+        # Clear any ghost text before saving
+        self.clear_ai_suggestion(tab_info.text_widget)
+        
+        file_path = tab_info.file_path
+        
+        if file_path:
+            # Save to existing path
+            self.start_save(tab_info, file_path, then)
+        else:
+            # New file, prompt for location
+            self.save_tab_as(tab_info, then)
+    
+    def save_as_current_tab(self, then=None):
         """Save current tab with new filename"""
         tab_info = self.get_current_tab_info()
         if tab_info:
-            file_path = filedialog.asksaveasfilename(
-                defaultextension=".py",
-                filetypes=[("Python Files", "*.py"), ("Text Files", "*.txt"), ("All Files", "*.*")]
-            )
+            self.save_tab_as(tab_info, then)
+    
+    def save_tab_as(self, tab_info, then=None):
+        """Ask for a filename and save the given tab to it"""
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".py",
+            filetypes=[("Python Files", "*.py"), ("Text Files", "*.txt"), ("All Files", "*.*")]
+        )
+        
+        if file_path:
+            self.start_save(tab_info, file_path, then)
+    
+    def start_save(self, tab_info, file_path, then=None):
+        """Snapshot a tab's text and write it to disk on a worker thread"""
+        content = tab_info.text_widget.get("1.0", "end-1c")
+        future = self._save_executor.submit(self._write_worker, tab_info, file_path, content, then)
+        self._save_futures.add(future)
+        future.add_done_callback(self._save_futures.discard)
+    
+    def _write_worker(self, tab_info, file_path, content, then):
+        """Write to a temp file and swap it in, so a crash never leaves half a file"""
+        # Encode up front and write in one call; keep text-mode line endings
+        data = content.replace("\n", os.linesep).encode('utf-8')
+        # Swap in beside the real file, so a symlink keeps pointing at it
+        real_path = os.path.realpath(file_path)
+        tmp_path = None
+        try:
+            # No fsync: return once the bytes reach the OS page cache
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(real_path), suffix=".tmp")
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
             
-            if file_path:
+            # Keep the original file's mode (e.g. the exec bit); new files get the umask default
+            if os.path.exists(real_path):
+                shutil.copymode(real_path, tmp_path)
+            else:
+                os.chmod(tmp_path, 0o666 & ~_UMASK)
+            os.replace(tmp_path, real_path)
+        except Exception as e:
+            if tmp_path:
                 try:
-                    text_widget = tab_info['text_widget']
-                    content = text_widget.get("1.0", "end-1c")
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
-                    
-                    # Update tab info
-                    tab_info['file_path'] = file_path
-                    tab_info['title'] = os.path.basename(file_path)
-                    tab_info['modified'] = False
-                    
-                    # Update tab title
-                    for i in range(self.notebook.index('end')):
-                        if str(self.notebook.nametowidget(self.notebook.tabs()[i])) == str(self.notebook.select()):
-                            self.notebook.tab(i, text=tab_info['title'])
-                            break
-                    
-                    messagebox.showinfo("Success", "File saved successfully!")
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to save file: {str(e)}")
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            self.root.after(0, messagebox.showerror, "Error", f"Failed to save file: {str(e)}")
+            return
+        self.root.after(0, self._on_save_done, tab_info, file_path, content, then)
+    
+    def _on_save_done(self, tab_info, file_path, content, then):
+        """Update tab state after a background save finished"""
+        text_widget = tab_info.text_widget
+        tab_id = self._tabid_by_widget.get(text_widget)
+        if not tab_id:
+            return  # Tab was closed while saving
+        
+        # Update tab info (Save As changes the path and title)
+        self.set_tab_path(tab_id, file_path)
+        
+        # Only clear the modified flag if nothing was typed during the write
+        if text_widget.get("1.0", "end-1c") == content:
+            tab_info.modified = False
+        prefix = MODIFIED_PREFIX if tab_info.modified else ''
+        self.notebook.tab(tab_info.tab_frame, text=prefix + tab_info.title)
+        self.flash_status("Saved: " + file_path)
+        
+        if then:
+            then()
     
     def open_file(self, file_path):
         """Open a file in a new tab"""
         # Check if file is already open
-        for tab_info in self.open_tabs.values():
-            if tab_info['file_path'] == file_path:
-                # Switch to existing tab
-                for i, tab in enumerate(self.notebook.tabs()):
-                    if str(self.notebook.nametowidget(tab)) in self.open_tabs:
-                        tab_id = str(self.notebook.nametowidget(tab))
-                        if self.open_tabs[tab_id]['file_path'] == file_path:
-                            self.notebook.select(i)
-                            return
-        
-        # Read file content
+        tab_id = self._path_to_tabid.get(self._path_key(file_path))
+        if tab_id:
+            # Switch to existing tab
+            self._select_tab(self.open_tabs[tab_id].tab_frame)
+            return
+        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Create new tab
-            title = os.path.basename(file_path)
-            self.create_editor_tab(title=title, content=content, file_path=file_path)
+            size = os.path.getsize(file_path)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open file: {str(e)}")
+            return
+        
+        if size > 2_000_000:
+            response = messagebox.askyesno(
+                "Large File",
+                f"{os.path.basename(file_path)} is {size / 1_000_000:.1f} MB and may be slow to edit.\n\n"
+                "Open it anyway?"
+            )
+            if not response:
+                return
+        
+        # Create an empty tab and stream the content in from a worker thread
+        title = os.path.basename(file_path)
+        tab_frame = self.create_editor_tab(title=title, file_path=file_path)
+        tab_info = self.open_tabs[str(tab_frame)]
+        tab_info.loading = True
+        text_widget = tab_info.text_widget
+        threading.Thread(target=self._read_worker, args=(file_path, text_widget), daemon=True).start()
+    
+    def _read_worker(self, file_path, text_widget):
+        """Read a file in 1 MB blocks and post each decoded block to the UI thread"""
+        # Binary reads skip the text layer; the decoder still translates newlines.
+        # Strict decoding, so a non-UTF-8 file fails to open instead of being
+        # silently mangled and then overwritten on the next save
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder('utf-8')(), translate=True)
+        try:
+            with open(file_path, 'rb', buffering=1 << 20) as f:
+                while text_widget in self._tabid_by_widget:
+                    raw = f.read(1 << 20)
+                    chunk = decoder.decode(raw, final=not raw)
+                    if chunk:
+                        self.root.after(0, self._append_chunk, text_widget, chunk)
+                    if not raw:
+                        break
+        except Exception as e:
+            self.root.after(0, self._load_failed, text_widget, e)
+            return
+        self.root.after(0, self._finish_load, text_widget)
+    
+    def _append_chunk(self, text_widget, chunk):
+        """Append a chunk of file content while a file is loading"""
+        if text_widget in self._tabid_by_widget:
+            text_widget.insert("end-1c", chunk)
+    
+    def _finish_load(self, text_widget):
+        """Re-enable modification tracking and highlighting after a load"""
+        tab_info = self.get_tab_info_for_widget(text_widget)
+        if not tab_info:
+            return  # Tab was closed while loading
+        tab_info.loading = False
+        tab_info.hl_view = None
+        text_widget.edit_reset()  # Loading shouldn't be undoable
+        text_widget.edit_modified(False)
+        text_widget.mark_set(tk.INSERT, "1.0")
+        self.update_line_numbers(text_widget, tab_info.line_numbers)
+        # Only the visible tab highlights now; a hidden one waits until it is selected
+        if tab_info is self.get_current_tab_info():
+            self.schedule_highlight(text_widget, delay=0)
+    
+    def _load_failed(self, text_widget, error):
+        """Close the half-loaded tab and report a read error"""
+        tab_id = self._tabid_by_widget.get(text_widget)
+        if tab_id:
+            self.open_tabs[tab_id].modified = False
+            self.close_tab(self.notebook.index(self.open_tabs[tab_id].tab_frame))
+        messagebox.showerror("Error", f"Failed to open file: {str(error)}")
     
     # File menu functions
     def file_new(self):
@@ -875,13 +1568,37 @@ class CodeEditor:
     
     def file_save(self):
         """Save the current file"""
-        self.save_current_tab()
+        # Coalesce a burst of Ctrl+S presses into one write
+        tab_info = self.get_current_tab_info()
+        if tab_info:
+            tab_id = self._tabid_by_widget[tab_info.text_widget]
+            self._debounce(('save', tab_id), 150, lambda: self.save_tab(tab_info))
     
     def file_save_as(self):
         """Save the current file with a new name"""
         self.save_as_current_tab()
     
     def file_exit(self):
+        if self._exiting:
+            return  # Already waiting for saves to finish
+        self._exiting = True
+        
+        # Run any Ctrl+S still waiting out its debounce
+        for key in [k for k in self._debouncers if isinstance(k, tuple) and k[0] == 'save']:
+            self._cancel_debounce(key)
+            tab_info = self.open_tabs.get(key[1])
+            if tab_info:
+                self.save_tab(tab_info)
+        self._finish_exit()
+    
+    def _finish_exit(self):
+        """Quit once every in-flight save has been written"""
+        # Workers post their results through root.after, so poll from the
+        # event loop rather than blocking it
+        if self._save_futures:
+            self.root.after(20, self._finish_exit)
+            return
+        self._save_executor.shutdown(wait=True)
         self.root.quit()
     
     # Edit menu functions
@@ -889,26 +1606,26 @@ class CodeEditor:
         """Cut selected text"""
         tab_info = self.get_current_tab_info()
         if tab_info:
-            tab_info['text_widget'].event_generate("<<Cut>>")
+            tab_info.text_widget.event_generate("<<Cut>>")
     
     def edit_copy(self):
         """Copy selected text"""
         tab_info = self.get_current_tab_info()
         if tab_info:
-            tab_info['text_widget'].event_generate("<<Copy>>")
+            tab_info.text_widget.event_generate("<<Copy>>")
     
     def edit_paste(self):
         """Paste text"""
         tab_info = self.get_current_tab_info()
         if tab_info:
-            tab_info['text_widget'].event_generate("<<Paste>>")
+            tab_info.text_widget.event_generate("<<Paste>>")
     
     def edit_undo(self):
         """Undo last action"""
         tab_info = self.get_current_tab_info()
         if tab_info:
             try:
-                tab_info['text_widget'].edit_undo()
+                tab_info.text_widget.edit_undo()
             except:
                 pass
     
@@ -917,7 +1634,7 @@ class CodeEditor:
         tab_info = self.get_current_tab_info()
         if tab_info:
             try:
-                tab_info['text_widget'].edit_redo()
+                tab_info.text_widget.edit_redo()
             except:
                 pass
     
@@ -1000,7 +1717,7 @@ class CodeEditor:
             total = self.notebook.index('end')
             if total > 0:
                 next_tab = (current + 1) % total
-                self.notebook.select(next_tab)
+                self._select_tab(next_tab)
         except:
             pass
     
@@ -1011,13 +1728,13 @@ class CodeEditor:
             total = self.notebook.index('end')
             if total > 0:
                 prev_tab = (current - 1) % total
-                self.notebook.select(prev_tab)
+                self._select_tab(prev_tab)
         except:
             pass
     
     def create_status_bar(self):
         """Create the status bar at the bottom"""
-        theme = self.themes[self.current_theme]
+        theme = self._theme
         self.status_bar = tk.Frame(self.root, bg=theme['status_bg'], height=25)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
         
@@ -1036,43 +1753,74 @@ class CodeEditor:
                                       bg=theme['status_bg'], fg="white", anchor=tk.E, padx=10)
         self.status_right.pack(side=tk.RIGHT)
     
+    def schedule_status_update(self, text_widget):
+        """Update the status bar once a burst of keystrokes settles"""
+        self._debounce('status', 50, lambda: self.update_status_bar(text_widget))
+    
     def update_status_bar(self, text_widget):
         """Update status bar with current cursor position"""
         try:
             # Get cursor position
             cursor_pos = text_widget.index(tk.INSERT)
             line, col = cursor_pos.split('.')
-            self.status_right.config(text=f"Ln {line}, Col {int(col) + 1}")
+            position = f"Ln {line}, Col {int(col) + 1}"
             
-            # Update file path if available
+            # Show file path if available
             tab_info = self.get_current_tab_info()
+            location = None
             if tab_info:
-                file_path = tab_info.get('file_path', 'Untitled')
-                if file_path:
-                    self.status_left.config(text=file_path)
-                else:
-                    self.status_left.config(text=tab_info['title'])
+                location = tab_info.file_path or tab_info.title
+            
+            # Label.config is costly; only touch labels whose text changed
+            if position != self._status_text[0]:
+                self.status_right.config(text=position)
+            if location and location != self._status_text[1]:
+                self.status_left.config(text=location)
+            self._status_text = (position, location or self._status_text[1])
         except:
             pass
     
+    def _reshow_dialog(self, dialog, entry):
+        """Bring back a hidden find/replace dialog with its search text selected"""
+        dialog.deiconify()
+        dialog.lift()
+        entry.select_range(0, tk.END)
+        entry.focus_set()
+    
+    def _clear_search_tag(self, text_widget):
+        """Remove the find highlight, touching only the span that is tagged"""
+        ranges = text_widget.tag_ranges("search")
+        if ranges:
+            text_widget.tag_remove("search", ranges[0], ranges[-1])
+    
+    def _show_search_match(self, text_widget, pos, length, cursor_at_end):
+        """Highlight a match, move the cursor to it and scroll it into view"""
+        # Raw Tcl calls skip tkinter's per-method option handling
+        tk_call, w = text_widget.tk.call, text_widget._w
+        end_pos = str(tk_call(w, 'index', f"{pos}+{length}c"))
+        tk_call(w, 'tag', 'add', 'search', pos, end_pos)
+        tk_call(w, 'mark', 'set', 'insert', end_pos if cursor_at_end else pos)
+        tk_call(w, 'see', pos)
+    
     def show_find_dialog(self):
         """Show find dialog"""
+        # The dialog is built once, then hidden and reshown
         if self.find_dialog and self.find_dialog.winfo_exists():
-            self.find_dialog.lift()
+            self._reshow_dialog(self.find_dialog, self._find_entry)
             return
         
-        tab_info = self.get_current_tab_info()
-        if not tab_info:
+        if not self.get_current_tab_info():
             return
         
         self.find_dialog = tk.Toplevel(self.root)
         self.find_dialog.title("Find")
         self.find_dialog.geometry("400x150")
         self.find_dialog.resizable(False, False)
+        self.find_dialog.protocol("WM_DELETE_WINDOW", self.find_dialog.withdraw)
         
         # Find entry
         tk.Label(self.find_dialog, text="Find:").grid(row=0, column=0, padx=10, pady=10, sticky=tk.W)
-        find_entry = tk.Entry(self.find_dialog, width=30)
+        find_entry = self._find_entry = tk.Entry(self.find_dialog, width=30)
         find_entry.grid(row=0, column=1, padx=10, pady=10)
         find_entry.focus()
         
@@ -1086,48 +1834,42 @@ class CodeEditor:
         btn_frame.grid(row=2, column=0, columnspan=2, pady=10)
         
         def find_next():
-            text_widget = tab_info['text_widget']
+            tab_info = self.get_current_tab_info()
+            if not tab_info:
+                return
+            text_widget = tab_info.text_widget
             search_text = find_entry.get()
             if not search_text:
                 return
             
             # Remove previous highlights
-            text_widget.tag_remove("search", "1.0", tk.END)
+            self._clear_search_tag(text_widget)
             
             # Get current cursor position
             start_pos = text_widget.index(tk.INSERT)
             
-            # Search for text
+            # Search for text, wrapping around to the beginning
             nocase = 0 if case_var.get() else 1
             pos = text_widget.search(search_text, start_pos, tk.END, nocase=nocase)
+            if not pos:
+                pos = text_widget.search(search_text, "1.0", tk.END, nocase=nocase)
             
             if pos:
-                # Highlight found text
-                end_pos = f"{pos}+{len(search_text)}c"
-                text_widget.tag_add("search", pos, end_pos)
-                text_widget.tag_config("search", background="yellow", foreground="black")
-                text_widget.mark_set(tk.INSERT, end_pos)
-                text_widget.see(pos)
+                self._show_search_match(text_widget, pos, len(search_text), True)
             else:
-                # Try from beginning
-                pos = text_widget.search(search_text, "1.0", tk.END, nocase=nocase)
-                if pos:
-                    end_pos = f"{pos}+{len(search_text)}c"
-                    text_widget.tag_add("search", pos, end_pos)
-                    text_widget.tag_config("search", background="yellow", foreground="black")
-                    text_widget.mark_set(tk.INSERT, end_pos)
-                    text_widget.see(pos)
-                else:
-                    messagebox.showinfo("Find", "No matches found")
+                messagebox.showinfo("Find", "No matches found")
         
         def find_prev():
-            text_widget = tab_info['text_widget']
+            tab_info = self.get_current_tab_info()
+            if not tab_info:
+                return
+            text_widget = tab_info.text_widget
             search_text = find_entry.get()
             if not search_text:
                 return
             
             # Remove previous highlights
-            text_widget.tag_remove("search", "1.0", tk.END)
+            self._clear_search_tag(text_widget)
             
             # Get current cursor position
             start_pos = text_widget.index(tk.INSERT)
@@ -1137,36 +1879,36 @@ class CodeEditor:
             pos = text_widget.search(search_text, start_pos, "1.0", backwards=True, nocase=nocase)
             
             if pos:
-                # Highlight found text
-                end_pos = f"{pos}+{len(search_text)}c"
-                text_widget.tag_add("search", pos, end_pos)
-                text_widget.tag_config("search", background="yellow", foreground="black")
-                text_widget.mark_set(tk.INSERT, pos)
-                text_widget.see(pos)
+                self._show_search_match(text_widget, pos, len(search_text), False)
             else:
                 messagebox.showinfo("Find", "No matches found")
         
         tk.Button(btn_frame, text="Find Next", command=find_next, width=10).pack(side=tk.LEFT, padx=5)
         tk.Button(btn_frame, text="Find Previous", command=find_prev, width=12).pack(side=tk.LEFT, padx=5)
-        tk.Button(btn_frame, text="Close", command=self.find_dialog.destroy, width=10).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Close", command=self.find_dialog.withdraw, width=10).pack(side=tk.LEFT, padx=5)
         
         # Bind Enter key to find next
         find_entry.bind("<Return>", lambda e: find_next())
     
     def show_replace_dialog(self):
         """Show find and replace dialog"""
-        tab_info = self.get_current_tab_info()
-        if not tab_info:
+        # The dialog is built once, then hidden and reshown
+        if self.replace_dialog and self.replace_dialog.winfo_exists():
+            self._reshow_dialog(self.replace_dialog, self._replace_find_entry)
+            return
+        
+        if not self.get_current_tab_info():
             return
         
-        replace_dialog = tk.Toplevel(self.root)
+        replace_dialog = self.replace_dialog = tk.Toplevel(self.root)
         replace_dialog.title("Find and Replace")
         replace_dialog.geometry("400x200")
         replace_dialog.resizable(False, False)
+        replace_dialog.protocol("WM_DELETE_WINDOW", replace_dialog.withdraw)
         
         # Find entry
         tk.Label(replace_dialog, text="Find:").grid(row=0, column=0, padx=10, pady=10, sticky=tk.W)
-        find_entry = tk.Entry(replace_dialog, width=30)
+        find_entry = self._replace_find_entry = tk.Entry(replace_dialog, width=30)
         find_entry.grid(row=0, column=1, padx=10, pady=10)
         find_entry.focus()
         
@@ -1185,51 +1927,44 @@ class CodeEditor:
         btn_frame.grid(row=3, column=0, columnspan=2, pady=10)
         
         def find_next():
-            text_widget = tab_info['text_widget']
+            tab_info = self.get_current_tab_info()
+            if not tab_info:
+                return
+            text_widget = tab_info.text_widget
             search_text = find_entry.get()
             if not search_text:
                 return
             
             # Remove previous highlights
-            text_widget.tag_remove("search", "1.0", tk.END)
+            self._clear_search_tag(text_widget)
             
             # Get current cursor position
             start_pos = text_widget.index(tk.INSERT)
             
-            # Search for text
+            # Search for text, wrapping around to the beginning
             nocase = 0 if case_var.get() else 1
             pos = text_widget.search(search_text, start_pos, tk.END, nocase=nocase)
+            if not pos:
+                pos = text_widget.search(search_text, "1.0", tk.END, nocase=nocase)
             
             if pos:
-                # Highlight found text
-                end_pos = f"{pos}+{len(search_text)}c"
-                text_widget.tag_add("search", pos, end_pos)
-                text_widget.tag_config("search", background="yellow", foreground="black")
-                text_widget.mark_set(tk.INSERT, end_pos)
-                text_widget.see(pos)
+                self._show_search_match(text_widget, pos, len(search_text), True)
                 return True
             else:
-                # Try from beginning
-                pos = text_widget.search(search_text, "1.0", tk.END, nocase=nocase)
-                if pos:
-                    end_pos = f"{pos}+{len(search_text)}c"
-                    text_widget.tag_add("search", pos, end_pos)
-                    text_widget.tag_config("search", background="yellow", foreground="black")
-                    text_widget.mark_set(tk.INSERT, end_pos)
-                    text_widget.see(pos)
-                    return True
-                else:
-                    messagebox.showinfo("Find", "No matches found")
-                    return False
+                messagebox.showinfo("Find", "No matches found")
+                return False
         
         def replace():
-            text_widget = tab_info['text_widget']
+            tab_info = self.get_current_tab_info()
+            if not tab_info:
+                return
+            text_widget = tab_info.text_widget
             search_text = find_entry.get()
             replace_text = replace_entry.get()
             
             # Check if current selection matches search text
             try:
-                sel_text = text_widget.get(tk.SEL_FIRST, tk.SEL_LAST)
+                sel_text = self._get_selection(text_widget)
                 if sel_text == search_text or (not case_var.get() and sel_text.lower() == search_text.lower()):
                     text_widget.delete(tk.SEL_FIRST, tk.SEL_LAST)
                     text_widget.insert(tk.INSERT, replace_text)
@@ -1240,49 +1975,55 @@ class CodeEditor:
             find_next()
         
         def replace_all():
-            text_widget = tab_info['text_widget']
+            tab_info = self.get_current_tab_info()
+            if not tab_info:
+                return
+            text_widget = tab_info.text_widget
             search_text = find_entry.get()
             replace_text = replace_entry.get()
             
             if not search_text:
                 return
             
-            count = 0
-            nocase = 0 if case_var.get() else 1
-            pos = "1.0"
+            # Replace in Python and swap the buffer once, instead of a Tcl edit per match
+            content = text_widget.get("1.0", "end-1c")
+            if case_var.get():
+                count = content.count(search_text)
+                new_content = content.replace(search_text, replace_text)
+            else:
+                pattern = re.compile(re.escape(search_text), re.IGNORECASE)
+                new_content, count = pattern.subn(lambda m: replace_text, content)
             
-            while True:
-                pos = text_widget.search(search_text, pos, tk.END, nocase=nocase)
-                if not pos:
-                    break
-                
-                end_pos = f"{pos}+{len(search_text)}c"
-                text_widget.delete(pos, end_pos)
-                text_widget.insert(pos, replace_text)
-                count += 1
-                pos = f"{pos}+{len(replace_text)}c"
+            if count:
+                # One undo step reverts the whole replacement
+                text_widget.configure(autoseparators=False)
+                text_widget.edit_separator()
+                text_widget.replace("1.0", "end-1c", new_content)
+                text_widget.edit_separator()
+                text_widget.configure(autoseparators=True)
             
             messagebox.showinfo("Replace All", f"Replaced {count} occurrence(s)")
-            replace_dialog.destroy()
+            replace_dialog.withdraw()
         
         tk.Button(btn_frame, text="Find Next", command=find_next, width=10).pack(side=tk.LEFT, padx=5)
         tk.Button(btn_frame, text="Replace", command=replace, width=10).pack(side=tk.LEFT, padx=5)
         tk.Button(btn_frame, text="Replace All", command=replace_all, width=10).pack(side=tk.LEFT, padx=5)
-        tk.Button(btn_frame, text="Close", command=replace_dialog.destroy, width=10).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Close", command=replace_dialog.withdraw, width=10).pack(side=tk.LEFT, padx=5)
         
         # Bind Enter key to find next
         find_entry.bind("<Return>", lambda e: find_next())
     
     def apply_theme(self, theme_name):
         """Apply a theme to the editor"""
-        if theme_name not in self.themes:
+        if theme_name not in self.themes or theme_name == self.current_theme:
             return
         
         self.current_theme = theme_name
         self.settings['theme'] = theme_name
         self.save_settings()
+        self._refresh_cached_style()
         
-        theme = self.themes[theme_name]
+        theme = self._theme
         
         # Update toolbar
         self.toolbar.config(bg=theme['toolbar_bg'])
@@ -1300,32 +2041,36 @@ class CodeEditor:
         self.status_center.config(bg=theme['status_bg'], fg='white')
         self.status_right.config(bg=theme['status_bg'], fg='white')
         
-        # Update all open tabs
+        # Restyle the visible tab now; hidden tabs catch up when selected
+        current = self.get_current_tab_info()
         for tab_info in self.open_tabs.values():
-            text_widget = tab_info['text_widget']
-            line_numbers = tab_info['line_numbers']
-            
-            # Update text widget
-            text_widget.config(
-                bg=theme['bg'],
-                fg=theme['fg'],
-                insertbackground=theme['insert_bg'],
-                selectbackground=theme['select_bg']
-            )
-            
-            # Update line numbers
-            line_numbers.config(
-                bg=theme['line_num_bg'],
-                fg=theme['line_num_fg']
-            )
-            
-            # Reconfigure syntax tags
-            self.configure_syntax_tags(text_widget)
-            
-            # Reapply syntax highlighting
-            self.apply_syntax_highlighting(text_widget)
+            tab_info.stale_theme = True
+        if current:
+            self._restyle_tab(current)
+        
+        self.flash_status(f"{theme_name.capitalize()} theme applied")
+    
+    def _restyle_tab(self, tab_info):
+        """Apply the current theme colours to one tab"""
+        theme = self._theme
+        text_widget = tab_info.text_widget
+        line_numbers = tab_info.line_numbers
+        tab_info.stale_theme = False
+        
+        # Update text widget
+        text_widget.config(
+            bg=theme['bg'],
+            fg=theme['fg'],
+            insertbackground=theme['insert_bg'],
+            selectbackground=theme['select_bg']
+        )
+        
+        # Update line numbers
+        line_numbers.config(bg=theme['line_num_bg'])
+        self.redraw_line_numbers(text_widget, line_numbers)
         
-        messagebox.showinfo("Theme Changed", f"{theme_name.capitalize()} theme applied!")
+        # Recolour syntax tags; the tagged ranges themselves don't change
+        self.configure_syntax_tags(text_widget)
     
     def show_settings_dialog(self):
         """Show settings/preferences dialog"""
@@ -1390,15 +2135,16 @@ class CodeEditor:
                 self.apply_theme(theme_var.get())
             
             # Update font in all open tabs
+            self._refresh_cached_style()
             for tab_info in self.open_tabs.values():
-                text_widget = tab_info['text_widget']
-                line_numbers = tab_info['line_numbers']
-                font = (self.settings['font_family'], self.settings['font_size'])
-                text_widget.config(font=font)
-                line_numbers.config(font=font)
+                text_widget = tab_info.text_widget
+                line_numbers = tab_info.line_numbers
+                text_widget.config(font=self._font)
+                tab_info.line_count = 0  # Re-measure the gutter for the new font
+                self.update_line_numbers(text_widget, line_numbers)
             
-            messagebox.showinfo("Settings", "Settings saved successfully!")
             settings_window.destroy()
+            self.flash_status("Settings saved")
         
         def reset_defaults():
             font_var.set('Consolas')
@@ -1421,25 +2167,20 @@ class CodeEditor:
             return
         
         # Clear any ghost text first
-        text_widget = tab_info.get('text_widget')
+        text_widget = tab_info.text_widget
         if text_widget:
             self.clear_ai_suggestion(text_widget)
         
-        file_path = tab_info.get('file_path')
+        file_path = tab_info.file_path
         
         # If file is not saved, prompt to save
-        if not file_path or tab_info.get('modified', False):
+        if not file_path or tab_info.modified:
             response = messagebox.askyesno("Save File", 
                                           "File must be saved before running. Save now?")
             if response:
-                self.file_save()
-                # Update file_path after save
-                tab_info = self.get_current_tab_info()
-                file_path = tab_info.get('file_path')
-                if not file_path:
-                    return
-            else:
-                return
+                # Saving runs in the background; run again once it's on disk
+                self.save_current_tab(then=self.run_code)
+            return
         
         # Check if it's a Python file
         if not file_path.endswith('.py'):
@@ -1458,6 +2199,28 @@ class CodeEditor:
         thread = threading.Thread(target=self.execute_python_file, args=(file_path,))
         thread.daemon = True
         thread.start()
+        
+        self._term_producers += 1
+        if self._term_producers == 1:
+            self.root.after(50, self._drain_terminal_queue)
+    
+    def _drain_terminal_queue(self):
+        """Move queued run output into the terminal with one insert per tick"""
+        chunks = []
+        while True:
+            try:
+                chunk = self._term_queue.get_nowait()
+            except queue.Empty:
+                break
+            if chunk is None:
+                self._term_producers -= 1  # A run finished
+            else:
+                chunks.append(chunk)
+        
+        if chunks:
+            self.append_terminal_output(''.join(chunks))
+        if self._term_producers > 0:
+            self.root.after(50, self._drain_terminal_queue)
     
     def execute_python_file(self, file_path):
         """Execute a Python file and capture output"""
@@ -1467,131 +2230,109 @@ class CodeEditor:
             
             # Run the Python file
             process = subprocess.Popen(
-                [sys.executable, file_path],
+                [self._py_exe, file_path],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 stdin=subprocess.PIPE,
                 cwd=file_dir,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+                bufsize=0,
+                # Our fds are non-inheritable already, so skip the close-all walk
+                close_fds=False,
+                start_new_session=True
             )
             
-            # Read output in real-time
-            def read_output(pipe, prefix=""):
-                for line in iter(pipe.readline, ''):
-                    if line:
-                        self.root.after(0, self.append_terminal_output, prefix + line)
+            # Same encoding text mode would have used for the pipes
+            encoding = locale.getpreferredencoding(False)
             
-            # Read stdout and stderr
-            stdout_thread = threading.Thread(target=read_output, args=(process.stdout,))
-            stderr_thread = threading.Thread(target=read_output, args=(process.stderr, "[ERROR] "))
+            def decode(data, prefix):
+                text = data.decode(encoding, errors='replace').replace('\r\n', '\n')
+                if prefix:
+                    text = ''.join(prefix + line for line in text.splitlines(True))
+                return text
             
-            stdout_thread.daemon = True
-            stderr_thread.daemon = True
+            # Output stream fd -> line prefix, and any partial line read so far
+            streams = {process.stdout.fileno(): "", process.stderr.fileno(): "[ERROR] "}
+            pending = dict.fromkeys(streams, b'')
             
-            stdout_thread.start()
-            stderr_thread.start()
+            def read_block(fd):
+                """Queue the complete lines from one read; False at end of stream"""
+                data = os.read(fd, 65536)
+                if not data:
+                    if pending[fd]:
+                        self._term_queue.put(decode(pending[fd], streams[fd]))
+                    return False
+                buf = pending[fd] + data
+                cut = buf.rfind(b'\n') + 1
+                if cut:
+                    self._term_queue.put(decode(buf[:cut], streams[fd]))
+                pending[fd] = buf[cut:]
+                return True
+            
+            if os.name == 'posix':
+                # One selector loop serves both pipes from this thread
+                with selectors.DefaultSelector() as sel:
+                    for fd in streams:
+                        sel.register(fd, selectors.EVENT_READ)
+                    while sel.get_map():
+                        for key, _ in sel.select():
+                            if not read_block(key.fd):
+                                sel.unregister(key.fd)
+            else:
+                # Windows can't select() on pipes, so read each on its own thread
+                def read_output(fd):
+                    while read_block(fd):
+                        pass
+                
+                threads = [threading.Thread(target=read_output, args=(fd,), daemon=True)
+                           for fd in streams]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
             
             # Wait for process to complete
             process.wait()
-            stdout_thread.join()
-            stderr_thread.join()
             
             # Show completion message
-            self.root.after(0, self.append_terminal_output, 
-                          f"\n{'=' * 60}\n")
-            self.root.after(0, self.append_terminal_output, 
-                          f"Process finished with exit code {process.returncode}\n")
+            self._term_queue.put(f"\n{'=' * 60}\n")
+            self._term_queue.put(f"Process finished with exit code {process.returncode}\n")
             
         except Exception as e:
-            self.root.after(0, self.append_terminal_output, 
-                          f"\n[ERROR] Failed to run file: {str(e)}\n")
+            self._term_queue.put(f"\n[ERROR] Failed to run file: {str(e)}\n")
+        finally:
+            self._term_queue.put(None)  # Lets the drain loop stop
     
     def show_shortcuts_help(self):
         """Show keyboard shortcuts help dialog"""
-        help_window = tk.Toplevel(self.root)
-        help_window.title("Keyboard Shortcuts")
-        help_window.geometry("500x600")
-        help_window.resizable(False, False)
-        
-        # Create text widget with scrollbar
-        text_frame = tk.Frame(help_window)
-        text_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        scrollbar = tk.Scrollbar(text_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # The window is built once, then hidden and reshown
+        if self._help_window and self._help_window.winfo_exists():
+            self._help_window.deiconify()
+            self._help_window.lift()
+            self._help_window.focus_set()
+            return
         
-        text = tk.Text(text_frame, wrap=tk.WORD, yscrollcommand=scrollbar.set,
-                       font=("Arial", 10), bg="#f0f0f0", padx=10, pady=10)
-        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=text.yview)
+        # Build while withdrawn so the window is mapped once, fully laid out
+        help_window = self._help_window = tk.Toplevel(self.root)
+        help_window.withdraw()
+        help_window.title("Keyboard Shortcuts")
+        help_window.protocol("WM_DELETE_WINDOW", help_window.withdraw)
         
-        shortcuts = """KEYBOARD SHORTCUTS
-
-FILE OPERATIONS
-Ctrl+N         New File
-Ctrl+O         Open File
-Ctrl+S         Save File
-Ctrl+Shift+S   Save As
-Ctrl+W         Close Tab
-
-EDITING
-Ctrl+Z         Undo
-Ctrl+Y         Redo
-Ctrl+Shift+Z   Redo
-Ctrl+X         Cut
-Ctrl+C         Copy
-Ctrl+V         Paste
-
-SEARCH
-Ctrl+F         Find
-Ctrl+H         Find and Replace
-
-NAVIGATION
-Ctrl+Tab       Next Tab
-Ctrl+Shift+Tab Previous Tab
-
-VIEW
-(Menu) Toggle Sidebar
-(Menu) Zoom In
-(Menu) Zoom Out
-
-FILE EXPLORER
-Double-click   Open File
-Right-click    Context Menu
-  - New File
-  - New Folder
-  - Rename
-  - Delete
-  - Refresh
-
-TAB CLOSING
-Right-click    Close Tab
-Middle-click   Close Tab
-Ctrl+W         Close Current Tab
-"""
+        # Static text, so a Label is enough; the window sizes itself to fit it
+        tk.Label(help_window, text=_SHORTCUTS_TEXT, justify=tk.LEFT, anchor=tk.NW,
+                 font=("Courier New", 10), bg="#f0f0f0", padx=10, pady=10).pack(
+                     fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        text.insert("1.0", shortcuts)
-        text.config(state='disabled')
+        # Escape/Return close it; no Close button needed
+        help_window.bind("<Escape>", lambda e: help_window.withdraw())
+        help_window.bind("<Return>", lambda e: help_window.withdraw())
         
-        # Close button
-        tk.Button(help_window, text="Close", command=help_window.destroy,
-                 width=10).pack(pady=10)
+        help_window.resizable(False, False)
+        help_window.deiconify()
+        help_window.focus_set()
     
     def show_about(self):
         """Show about dialog"""
-        messagebox.showinfo("About Code Editor",
-                           "Code Editor v1.0\n\n"
-                           "A VS Code-inspired text editor built with Tkinter\n\n"
-                           "Features:\n"
-                           "• Syntax highlighting for Python\n"
-                           "• File explorer with context menu\n"
-                           "• Find and replace\n"
-                           "• Line numbers\n"
-                           "• Multiple tabs\n"
-                           "• Status bar\n"
-                           "• AI-powered code completion and explanation\n")
+        messagebox.showinfo("About Code Editor", _ABOUT_TEXT)
     
     # ============================================================================
     # AI SERVICE METHODS (Step 2 & 3)
@@ -1614,6 +2355,12 @@ Ctrl+W         Close Current Tab
     def update_status_left(self, message):
         """Update left side of status bar"""
         self.status_left.config(text=message)
+        self._status_text = (self._status_text[0], None)
+    
+    def flash_status(self, message, ms=2000):
+        """Show a message in the status bar briefly, then go back to Ready"""
+        self.update_status_left(message)
+        self._debounce('status_flash', ms, lambda: self.update_status_left("Ready"))
     
     def on_mouse_click(self, event, text_widget):
         """Handle mouse click to clear ghost text"""
@@ -1701,8 +2448,8 @@ Ctrl+W         Close Current Tab
             file_name = "untitled"
             language = "python"
             
-            if tab_info and tab_info['file_path']:
-                file_name = os.path.basename(tab_info['file_path'])
+            if tab_info and tab_info.file_path:
+                file_name = os.path.basename(tab_info.file_path)
                 ext = os.path.splitext(file_name)[1]
                 if ext == '.py':
                     language = 'python'
@@ -1740,7 +2487,7 @@ Ctrl+W         Close Current Tab
         try:
             # Double-check we're still in the right widget
             current_tab = self.get_current_tab_info()
-            if not current_tab or current_tab['text_widget'] != text_widget:
+            if not current_tab or current_tab.text_widget != text_widget:
                 return
             
             if not suggestion or suggestion.strip() == "":
@@ -1766,7 +2513,7 @@ Ctrl+W         Close Current Tab
             self.ai_suggestion_start_pos = cursor_pos
             
             # Create tag for ghost text with refined appearance
-            theme = self.themes[self.current_theme]
+            theme = self._theme
             font_family = self.settings.get('font_family', 'Consolas')
             font_size = self.settings.get('font_size', 11)
             
@@ -1889,7 +2636,7 @@ Ctrl+W         Close Current Tab
         """Manually trigger AI completion (Ctrl+Space)"""
         tab_info = self.get_current_tab_info()
         if tab_info:
-            text_widget = tab_info['text_widget']
+            text_widget = tab_info.text_widget
             self.clear_ai_suggestion(text_widget)
             self.request_ai_suggestion(text_widget)
     
@@ -1903,7 +2650,7 @@ Ctrl+W         Close Current Tab
         
         # Check if text is selected
         try:
-            selected_text = text_widget.get(tk.SEL_FIRST, tk.SEL_LAST)
+            selected_text = self._get_selection(text_widget)
             has_selection = len(selected_text) > 0
         except:
             has_selection = False
@@ -1939,14 +2686,14 @@ Ctrl+W         Close Current Tab
         if not tab_info:
             return
         
-        text_widget = tab_info['text_widget']
+        text_widget = tab_info.text_widget
         
         # Clear any ghost text first
         self.clear_ai_suggestion(text_widget)
         
         # Get selected text
         try:
-            selected_code = text_widget.get(tk.SEL_FIRST, tk.SEL_LAST)
+            selected_code = self._get_selection(text_widget)
         except:
             messagebox.showwarning("No Selection", "Please select code to explain.")
             return
@@ -1964,7 +2711,7 @@ Ctrl+W         Close Current Tab
     
     def show_code_explanation_dialog(self, code, tab_info):
         """Show AI explanation in right panel"""
-        theme = self.themes[self.current_theme]
+        theme = self._theme
         
         # Create or show AI explanation panel
         if self.ai_explanation_panel is None:
@@ -2047,8 +2794,8 @@ Ctrl+W         Close Current Tab
         # Get file info
         file_name = "untitled"
         language = "python"
-        if tab_info['file_path']:
-            file_name = os.path.basename(tab_info['file_path'])
+        if tab_info.file_path:
+            file_name = os.path.basename(tab_info.file_path)
             ext = os.path.splitext(file_name)[1]
             language = 'python' if ext == '.py' else 'code'
         
@@ -2099,14 +2846,14 @@ Ctrl+W         Close Current Tab
         if not tab_info:
             return
         
-        text_widget = tab_info['text_widget']
+        text_widget = tab_info.text_widget
         
         # Clear any ghost text first
         self.clear_ai_suggestion(text_widget)
         
         # Try to get selected text first
         try:
-            selected_text = text_widget.get(tk.SEL_FIRST, tk.SEL_LAST)
+            selected_text = self._get_selection(text_widget)
             requirement = selected_text.strip()
             selection_start = text_widget.index(tk.SEL_FIRST)
             selection_end = text_widget.index(tk.SEL_LAST)
@@ -2155,7 +2902,7 @@ Ctrl+W         Close Current Tab
         dialog.title("AI Code Generation")
         dialog.geometry("800x600")
         
-        theme = self.themes[self.current_theme]
+        theme = self._theme
         dialog.configure(bg=theme['bg'])
         
         # Title bar
@@ -2223,15 +2970,15 @@ Ctrl+W         Close Current Tab
         close_btn.pack(side=tk.RIGHT, padx=5)
         
         # Get context and file info
-        cursor_pos = tab_info['text_widget'].index(tk.INSERT)
-        context_start = tab_info['text_widget'].index(f"{cursor_pos} - 50 lines")
-        context_end = tab_info['text_widget'].index(f"{cursor_pos} + 20 lines")
-        context = tab_info['text_widget'].get(context_start, context_end)
+        cursor_pos = tab_info.text_widget.index(tk.INSERT)
+        context_start = tab_info.text_widget.index(f"{cursor_pos} - 50 lines")
+        context_end = tab_info.text_widget.index(f"{cursor_pos} + 20 lines")
+        context = tab_info.text_widget.get(context_start, context_end)
         
         file_name = "untitled"
         language = "python"
-        if tab_info['file_path']:
-            file_name = os.path.basename(tab_info['file_path'])
+        if tab_info.file_path:
+            file_name = os.path.basename(tab_info.file_path)
             ext = os.path.splitext(file_name)[1]
             language = 'python' if ext == '.py' else 'code'
         
@@ -2240,7 +2987,7 @@ Ctrl+W         Close Current Tab
         def apply_code():
             """Apply generated code to editor"""
             if generated_code[0]:
-                text_widget = tab_info['text_widget']
+                text_widget = tab_info.text_widget
                 if replace_mode:
                     text_widget.delete(start_pos, end_pos)
                 text_widget.insert(start_pos, generated_code[0])
@@ -2307,14 +3054,14 @@ Ctrl+W         Close Current Tab
         if not tab_info:
             return
         
-        text_widget = tab_info['text_widget']
+        text_widget = tab_info.text_widget
         
         # Clear any ghost text first
         self.clear_ai_suggestion(text_widget)
         
         # Get selected text
         try:
-            selected_code = text_widget.get(tk.SEL_FIRST, tk.SEL_LAST)
+            selected_code = self._get_selection(text_widget)
             selection_start = text_widget.index(tk.SEL_FIRST)
             selection_end = text_widget.index(tk.SEL_LAST)
         except:
@@ -2342,7 +3089,7 @@ Ctrl+W         Close Current Tab
     
     def show_refactoring_panel(self, code, start_pos, end_pos, tab_info):
         """Show refactoring suggestions in AI panel"""
-        theme = self.themes[self.current_theme]
+        theme = self._theme
         
         # Create or show AI panel
         if self.ai_explanation_panel is None:
@@ -2409,8 +3156,8 @@ Ctrl+W         Close Current Tab
         # Get file info
         file_name = "untitled"
         language = "python"
-        if tab_info['file_path']:
-            file_name = os.path.basename(tab_info['file_path'])
+        if tab_info.file_path:
+            file_name = os.path.basename(tab_info.file_path)
             ext = os.path.splitext(file_name)[1]
             language = 'python' if ext == '.py' else 'code'
         
@@ -2454,14 +3201,14 @@ Ctrl+W         Close Current Tab
         if not tab_info:
             return
         
-        text_widget = tab_info['text_widget']
+        text_widget = tab_info.text_widget
         
         # Clear any ghost text first
         self.clear_ai_suggestion(text_widget)
         
         # Get selected text
         try:
-            selected_code = text_widget.get(tk.SEL_FIRST, tk.SEL_LAST)
+            selected_code = self._get_selection(text_widget)
             selection_start = text_widget.index(tk.SEL_FIRST)
             selection_end = text_widget.index(tk.SEL_LAST)
         except:
@@ -2497,7 +3244,7 @@ Ctrl+W         Close Current Tab
             messagebox.showerror("AI Not Available", "AI service is not initialized.")
             return
         
-        text_widget = tab_info['text_widget']
+        text_widget = tab_info.text_widget
         
         # Clear any ghost text first
         self.clear_ai_suggestion(text_widget)
@@ -2514,7 +3261,7 @@ Ctrl+W         Close Current Tab
     
     def show_bug_scan_panel(self, code, tab_info):
         """Show comprehensive bug scan with issue list and line highlighting"""
-        theme = self.themes[self.current_theme]
+        theme = self._theme
         
         # Create or show AI panel
         if self.ai_explanation_panel is None:
@@ -2590,15 +3337,15 @@ Ctrl+W         Close Current Tab
         issues_text.config(state='disabled')
         
         # Clear any existing highlights
-        text_widget = tab_info['text_widget']
+        text_widget = tab_info.text_widget
         text_widget.tag_remove("bug_highlight", "1.0", tk.END)
         text_widget.tag_configure("bug_highlight", background="#ff4444", foreground="#ffffff")
         
         # Get file info
         file_name = "untitled"
         language = "python"
-        if tab_info['file_path']:
-            file_name = os.path.basename(tab_info['file_path'])
+        if tab_info.file_path:
+            file_name = os.path.basename(tab_info.file_path)
             ext = os.path.splitext(file_name)[1]
             language = 'python' if ext == '.py' else 'code'
         
@@ -2739,7 +3486,7 @@ Ctrl+W         Close Current Tab
     
     def jump_to_line(self, line_number, tab_info):
         """Jump to a specific line in the editor"""
-        text_widget = tab_info['text_widget']
+        text_widget = tab_info.text_widget
         
         # Move cursor to line
         text_widget.mark_set(tk.INSERT, f"{line_number}.0")
@@ -2761,7 +3508,7 @@ Ctrl+W         Close Current Tab
     
     def show_bug_fix_panel(self, code, error_message, start_pos, end_pos, tab_info):
         """Show bug detection and fixes in AI panel"""
-        theme = self.themes[self.current_theme]
+        theme = self._theme
         
         # Create or show AI panel
         if self.ai_explanation_panel is None:
@@ -2826,8 +3573,8 @@ Ctrl+W         Close Current Tab
         # Get file info
         file_name = "untitled"
         language = "python"
-        if tab_info['file_path']:
-            file_name = os.path.basename(tab_info['file_path'])
+        if tab_info.file_path:
+            file_name = os.path.basename(tab_info.file_path)
             ext = os.path.splitext(file_name)[1]
             language = 'python' if ext == '.py' else 'code'
         
@@ -2868,14 +3615,14 @@ Ctrl+W         Close Current Tab
         if not tab_info:
             return
         
-        text_widget = tab_info['text_widget']
+        text_widget = tab_info.text_widget
         
         # Clear any ghost text first
         self.clear_ai_suggestion(text_widget)
         
         # Get selected text
         try:
-            selected_code = text_widget.get(tk.SEL_FIRST, tk.SEL_LAST)
+            selected_code = self._get_selection(text_widget)
         except:
             messagebox.showwarning("No Selection", "Please select code to document.")
             return
@@ -2900,7 +3647,7 @@ Ctrl+W         Close Current Tab
             messagebox.showerror("AI Not Available", "AI service is not initialized.")
             return
         
-        theme = self.themes[self.current_theme]
+        theme = self._theme
         
         # Create or show AI panel
         if self.ai_explanation_panel is None:
@@ -3044,10 +3791,10 @@ Ctrl+W         Close Current Tab
             self.context_label.config(text="⚠ No file open")
             return
         
-        text_widget = tab_info['text_widget']
+        text_widget = tab_info.text_widget
         
         try:
-            selected_code = text_widget.get(tk.SEL_FIRST, tk.SEL_LAST)
+            selected_code = self._get_selection(text_widget)
             if selected_code.strip():
                 # Store in chat input as context
                 current_text = self.chat_input.get("1.0", tk.END).strip()
@@ -3065,8 +3812,8 @@ Ctrl+W         Close Current Tab
                 file_content = file_content[:2000] + "\n... (truncated)"
             
             file_name = "untitled"
-            if tab_info['file_path']:
-                file_name = os.path.basename(tab_info['file_path'])
+            if tab_info.file_path:
+                file_name = os.path.basename(tab_info.file_path)
             
             current_text = self.chat_input.get("1.0", tk.END).strip()
             if current_text:
@@ -3108,8 +3855,8 @@ Ctrl+W         Close Current Tab
                 # Get file context if available
                 tab_info = self.get_current_tab_info()
                 file_context = ""
-                if tab_info and tab_info['file_path']:
-                    file_name = os.path.basename(tab_info['file_path'])
+                if tab_info and tab_info.file_path:
+                    file_name = os.path.basename(tab_info.file_path)
                     file_context = f"Current file: {file_name}"
                 
                 # Build conversation history for context
@@ -3230,7 +3977,7 @@ Ctrl+W         Close Current Tab
     
     def show_indexing_progress(self, workspace_path):
         """Show progress dialog while indexing workspace"""
-        theme = self.themes[self.current_theme]
+        theme = self._theme
         
         dialog = tk.Toplevel(self.root)
         dialog.title("Indexing Workspace")
@@ -3269,8 +4016,8 @@ Ctrl+W         Close Current Tab
         
         def index_files():
             try:
-                update_progress(f"📁 Workspace: {workspace_path}")
-                update_progress("")
+                self.root.after(0, update_progress, f"📁 Workspace: {workspace_path}")
+                self.root.after(0, update_progress, "")
                 
                 # Find all Python files
                 python_files = []
@@ -3283,8 +4030,8 @@ Ctrl+W         Close Current Tab
                             file_path = os.path.join(root, file)
                             python_files.append(file_path)
                 
-                update_progress(f"✓ Found {len(python_files)} Python files")
-                update_progress("")
+                self.root.after(0, update_progress, f"✓ Found {len(python_files)} Python files")
+                self.root.after(0, update_progress, "")
                 
                 # Index each file
                 self.workspace_index = {}
@@ -3352,7 +4099,7 @@ Ctrl+W         Close Current Tab
                 self.root.after(0, lambda: close_btn.config(state='normal'))
                 
             except Exception as e:
-                self.root.after(0, lambda: update_progress(f"\n❌ Error: {str(e)}"))
+                self.root.after(0, update_progress, f"\n❌ Error: {str(e)}")
                 self.root.after(0, lambda: status_label.config(text="❌ Indexing failed"))
                 self.root.after(0, lambda: close_btn.config(state='normal'))
         
@@ -3371,7 +4118,7 @@ Ctrl+W         Close Current Tab
                 self.index_workspace()
             return
         
-        theme = self.themes[self.current_theme]
+        theme = self._theme
         
         # Create search dialog
         dialog = tk.Toplevel(self.root)
@@ -3526,11 +4273,11 @@ Ctrl+W         Close Current Tab
         if not tab_info:
             return
         
-        text_widget = tab_info['text_widget']
+        text_widget = tab_info.text_widget
         
         # Get selected code
         try:
-            selected_code = text_widget.get(tk.SEL_FIRST, tk.SEL_LAST).strip()
+            selected_code = self._get_selection(text_widget).strip()
         except:
             messagebox.showwarning("No Selection", "Please select code to find similar patterns.")
             return
@@ -3538,7 +4285,7 @@ Ctrl+W         Close Current Tab
         if not selected_code:
             return
         
-        theme = self.themes[self.current_theme]
+        theme = self._theme
         
         # Create results dialog
         dialog = tk.Toplevel(self.root)
@@ -3618,7 +4365,7 @@ Ctrl+W         Close Current Tab
                 self.index_workspace()
             return
         
-        theme = self.themes[self.current_theme]
+        theme = self._theme
         
         # Create overview panel in AI panel
         if self.ai_explanation_panel is None:
@@ -1,11 +1,41 @@
 import tkinter as tk
-from tkinter import ttk
-import os
+import errno
+from concurrent.futures import ThreadPoolExecutor
+
+# 16x16 PNG icons for file explorer rows (folder and file)
+_DIR_PNG_B64 = (
+    "iVBORw0KGgoAAAANSUhEUgAAABAAAAAQCAYAAAAf8/9hAAAAJElEQVR42mNgGB5g37So/9gw/Qy4s63q"
+    "Pzl41IBRA1AMGFAAAMA4n5agMu7BAAAAAElFTkSuQmCC"
+)
+_FILE_PNG_B64 = (
+    "iVBORw0KGgoAAAANSUhEUgAAABAAAAAQCAYAAAAf8/9hAAAAK0lEQVR42mNgoCY4evTof2IwXgOePXuG"
+    "Fw8RA3D5fdQLo14g2gCKMhM5AAALEuzi0/an+wAAAABJRU5ErkJggg=="
+)
 
 class CodeEditor:
+    # Shared toolbar button styling
+    _BTN_KW = dict(bg="#3d3d3d", fg="white", relief=tk.FLAT, padx=10)
+    _PACK_KW = dict(side=tk.LEFT, padx=2, pady=5)
+    _style_configured = False  # Treeview ttk style applied
+    _VIRTUAL_MIN = 1000  # Folders larger than this page in as they scroll into view
+    
     def __init__(self, root):
         self.root = root
         self.sidebar_visible = True
+        self._unexpanded = {}  # Folder item whose children aren't loaded yet -> placeholder child
+        self._item_path = {}  # Tree item id -> filesystem path
+        self._pager = {}  # "Load more" item id -> (parent, entries, next offset)
+        self._page_size = 200  # Entries inserted per folder page
+        self._reflow_pending = False
+        self._io_pool = ThreadPoolExecutor(max_workers=2)  # Directory scans
+        self._refresh_pending = False
+        self._refresh_items = set()  # Tree items waiting for a refresh ("" = whole tree)
+        self._refresh_interval = 50  # ms; caps tree refreshes at ~20 per second
+        self._resize_job = None  # Pending after() id for layout updates
+        self._pane_size = (0, 0)
+        # tkinter registers a new Tcl command for every Python callback it is
+        # handed, so register the placeholder once and share its name
+        self._noop_cmd = self.root.register(CodeEditor._noop)
         self.setup_window()
         self.create_menu_bar()
         self.create_toolbar()
@@ -32,58 +62,65 @@ class CodeEditor:
         menubar = tk.Menu(self.root)
         self.root.config(menu=menubar)
         
-        # File menu
+        # Submenus start empty and are filled the first time they are posted
         file_menu = tk.Menu(menubar, tearoff=0)
+        file_menu.configure(postcommand=lambda m=file_menu: self._populate_file_menu(m))
         menubar.add_cascade(label="File", menu=file_menu)
-        file_menu.add_command(label="New", command=self.file_new)
-        file_menu.add_command(label="Open", command=self.file_open)
-        file_menu.add_command(label="Save", command=self.file_save)
-        file_menu.add_command(label="Save As", command=self.file_save_as)
-        file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.file_exit)
         
-        # Edit menu
         edit_menu = tk.Menu(menubar, tearoff=0)
+        edit_menu.configure(postcommand=lambda m=edit_menu: self._populate_edit_menu(m))
         menubar.add_cascade(label="Edit", menu=edit_menu)
-        edit_menu.add_command(label="Cut", command=self.edit_cut)
-        edit_menu.add_command(label="Copy", command=self.edit_copy)
-        edit_menu.add_command(label="Paste", command=self.edit_paste)
-        edit_menu.add_separator()
-        edit_menu.add_command(label="Undo", command=self.edit_undo)
-        edit_menu.add_command(label="Redo", command=self.edit_redo)
         
-        # View menu
         view_menu = tk.Menu(menubar, tearoff=0)
+        view_menu.configure(postcommand=lambda m=view_menu: self._populate_view_menu(m))
         menubar.add_cascade(label="View", menu=view_menu)
+    
+    def _populate_file_menu(self, file_menu):
+        """Fill the File menu on first post"""
+        if file_menu.index("end") is not None:
+            return
+        file_menu.add_command(label="New", command=self._noop_cmd)
+        file_menu.add_command(label="Open", command=self._noop_cmd)
+        file_menu.add_command(label="Save", command=self._noop_cmd)
+        file_menu.add_command(label="Save As", command=self._noop_cmd)
+        file_menu.add_separator()
+        file_menu.add_command(label="Exit", command=self.file_exit)
+    
+    def _populate_edit_menu(self, edit_menu):
+        """Fill the Edit menu on first post"""
+        if edit_menu.index("end") is not None:
+            return
+        edit_menu.add_command(label="Cut", command=self._noop_cmd)
+        edit_menu.add_command(label="Copy", command=self._noop_cmd)
+        edit_menu.add_command(label="Paste", command=self._noop_cmd)
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Undo", command=self._noop_cmd)
+        edit_menu.add_command(label="Redo", command=self._noop_cmd)
+    
+    def _populate_view_menu(self, view_menu):
+        """Fill the View menu on first post"""
+        if view_menu.index("end") is not None:
+            return
         view_menu.add_command(label="Toggle Sidebar", command=self.view_toggle_sidebar)
         view_menu.add_separator()
-        view_menu.add_command(label="Zoom In", command=self.view_zoom_in)
-        view_menu.add_command(label="Zoom Out", command=self.view_zoom_out)
+        view_menu.add_command(label="Zoom In", command=self._noop_cmd)
+        view_menu.add_command(label="Zoom Out", command=self._noop_cmd)
     
     def create_toolbar(self):
         """Create the toolbar"""
         toolbar = tk.Frame(self.root, bg="#2d2d2d", height=40)
         toolbar.pack(side=tk.TOP, fill=tk.X)
         
-        # New file button
-        btn_new = tk.Button(toolbar, text="New", command=self.file_new, 
-                           bg="#3d3d3d", fg="white", relief=tk.FLAT, padx=10)
-        btn_new.pack(side=tk.LEFT, padx=2, pady=5)
-        
-        # Open file button
-        btn_open = tk.Button(toolbar, text="Open", command=self.file_open,
-                            bg="#3d3d3d", fg="white", relief=tk.FLAT, padx=10)
-        btn_open.pack(side=tk.LEFT, padx=2, pady=5)
-        
-        # Save button
-        btn_save = tk.Button(toolbar, text="Save", command=self.file_save,
-                            bg="#3d3d3d", fg="white", relief=tk.FLAT, padx=10)
-        btn_save.pack(side=tk.LEFT, padx=2, pady=5)
-        
-        # Run button
-        btn_run = tk.Button(toolbar, text="Run", command=self.run_code,
-                           bg="#3d3d3d", fg="white", relief=tk.FLAT, padx=10)
-        btn_run.pack(side=tk.LEFT, padx=2, pady=5)
+        self._mkbtn(toolbar, "New", self._noop_cmd)
+        self._mkbtn(toolbar, "Open", self._noop_cmd)
+        self._mkbtn(toolbar, "Save", self._noop_cmd)
+        self._mkbtn(toolbar, "Run", self._noop_cmd)
+    
+    def _mkbtn(self, toolbar, label, cmd):
+        """Create and pack a toolbar button"""
+        b = tk.Button(toolbar, text=label, command=cmd, **self._BTN_KW)
+        b.pack(**self._PACK_KW)
+        return b
     
     def create_main_container(self):
         """Create the main container with resizable panes"""
@@ -91,6 +128,7 @@ class CodeEditor:
         self.paned_window = tk.PanedWindow(self.root, orient=tk.HORIZONTAL, 
                                            sashwidth=5, bg="#2d2d2d")
         self.paned_window.pack(fill=tk.BOTH, expand=True)
+        self.paned_window.bind("<Configure>", self._on_pane_configure)
         
         # Left pane for file explorer
         self.left_pane = tk.Frame(self.paned_window, bg="#1e1e1e", width=250)
@@ -100,8 +138,28 @@ class CodeEditor:
         self.right_pane = tk.Frame(self.paned_window, bg="#1e1e1e")
         self.paned_window.add(self.right_pane, minsize=400)
     
+    def _on_pane_configure(self, event):
+        """Coalesce resize/sash-drag events into one layout pass every 30 ms"""
+        self._pane_size = (event.width, event.height)
+        if self._resize_job is None:
+            self._resize_job = self.root.after(30, self._apply_resize)
+    
+    def _apply_resize(self):
+        """Run the pending layout update"""
+        self._resize_job = None
+        self.on_layout_changed(*self._pane_size)
+    
+    def on_layout_changed(self, width, height):
+        """Hook called after the main pane settles on a new size"""
+    
     def create_file_explorer(self):
         """Create the file explorer sidebar"""
+        # Deferred imports: ttk pulls in the Tcl ttk package, so only pay for
+        # it (and os) once the sidebar is actually built
+        from tkinter import ttk
+        import os
+        self._os = os
+        
         # Title label
         title_frame = tk.Frame(self.left_pane, bg="#1e1e1e")
         title_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -114,120 +172,256 @@ class CodeEditor:
         tree_frame = tk.Frame(self.left_pane, bg="#1e1e1e")
         tree_frame.pack(fill=tk.BOTH, expand=True, padx=0, pady=0)
         
-        # Configure Treeview style BEFORE creating the widget
-        style = ttk.Style()
-        style.theme_use('clam')  # Use clam theme for better customization
-        style.configure("Treeview", 
-                       background="#1e1e1e", 
-                       foreground="#cccccc", 
-                       fieldbackground="#1e1e1e",
-                       borderwidth=0, 
-                       relief="flat")
-        style.map("Treeview", background=[("selected", "#094771")])
+        # Configure Treeview style BEFORE creating the widget. Ttk styles are
+        # process-wide, so this only needs to happen for the first editor
+        if not CodeEditor._style_configured:
+            style = ttk.Style()
+            style.theme_use('clam')  # Use clam theme for better customization
+            style.configure("Treeview", 
+                           background="#1e1e1e", 
+                           foreground="#cccccc", 
+                           fieldbackground="#1e1e1e",
+                           borderwidth=0, 
+                           relief="flat")
+            style.map("Treeview", background=[("selected", "#094771")])
+            CodeEditor._style_configured = True
         
         # Treeview widget
-        self.file_tree = ttk.Treeview(tree_frame, yscrollcommand=lambda *args: scrollbar.set(*args))
+        self.file_tree = ttk.Treeview(tree_frame, yscrollcommand=self._on_tree_scroll)
         self.file_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
+        # Row icons are shared images, so Tk doesn't shape emoji glyphs per row
+        self._ico_dir = tk.PhotoImage(data=_DIR_PNG_B64)
+        self._ico_file = tk.PhotoImage(data=_FILE_PNG_B64)
+        
         # Scrollbar
         scrollbar = tk.Scrollbar(tree_frame, bg="#2d2d2d", troughcolor="#1e1e1e", 
                                 activebackground="#3e3e3e", highlightthickness=0, 
                                 bd=0, relief=tk.FLAT)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         scrollbar.config(command=self.file_tree.yview)
+        self._tree_scrollbar = scrollbar
         
         # Bind events
+        self.file_tree.bind("<Configure>", lambda e: self._schedule_reflow())
         self.file_tree.bind("<<TreeviewOpen>>", self.on_folder_expand)
         self.file_tree.bind("<Double-1>", self.on_file_double_click)
+        self.file_tree.tag_bind("more", "<Button-1>", self.on_load_more)
         
         # Populate with current directory
         self.populate_tree()
     
+    def _on_tree_scroll(self, first, last):
+        """Keep the scrollbar in sync and check for newly visible pages"""
+        self._tree_scrollbar.set(first, last)
+        self._schedule_reflow()
+    
+    def _schedule_reflow(self):
+        """Coalesce scroll/resize events into one _reflow per idle cycle"""
+        if not self._reflow_pending:
+            self._reflow_pending = True
+            self.root.after_idle(self._reflow)
+    
+    def _reflow(self):
+        """
+        Insert the next page of any large folder whose "Load more…" row
+        has scrolled into view, so only rows near the viewport exist
+        """
+        self._reflow_pending = False
+        for node, (parent, entries, offset) in list(self._pager.items()):
+            if len(entries) > self._VIRTUAL_MIN and self.file_tree.bbox(node):
+                self._load_page(node)
+    
     def populate_tree(self, parent="", path=None):
         """Populate the tree with files and folders"""
         if path is None:
-            path = os.getcwd()
+            path = self._os.getcwd()
             # Clear existing items
             for item in self.file_tree.get_children():
                 self.file_tree.delete(item)
+            self._unexpanded.clear()
+            self._item_path.clear()
+            self._pager.clear()
             # Add root
-            node = self.file_tree.insert("", "end", text=path, values=[path], open=True)
-            parent = node
+            node = self.file_tree.insert("", "end", text=path, open=True)
+            self._item_path[node] = path
+            self._insert_entries(node, self._scan_entries(path))
+        else:
+            self._apply_scan(parent, self._scan_entries(path))
+    
+    def _scan_entries(self, path):
+        """Read a directory into sorted (name, path, is_dir) tuples"""
+        try:
+            # scandir entries carry the file type from the directory read,
+            # so is_dir() doesn't need an extra stat per entry
+            with self._os.scandir(path) as it:
+                entries = [(e.name, e.path, e.is_dir(follow_symlinks=False)) for e in it]
+        except OSError as e:
+            # Skip unreadable or vanished folders instead of aborting the tree
+            if e.errno in (errno.EACCES, errno.EPERM, errno.ENOENT, errno.ENOTDIR):
+                return []
+            raise
+        # Sort: directories first, then files
+        entries.sort(key=lambda t: (not t[2], t[0].lower()))
+        return entries
+    
+    def _insert_entries(self, parent, entries, offset=0):
+        """
+        Insert one page of scanned entries under a tree item, followed by
+        a "Load more…" row when the folder has further entries
+        """
+        # Local aliases keep attribute lookups out of the loop
+        insert = self.file_tree.insert
+        unexpanded = self._unexpanded
+        item_path = self._item_path
+        ico_dir = self._ico_dir
+        ico_file = self._ico_file
+        end = offset + self._page_size
+        for name, path, is_dir in entries[offset:end]:
+            if is_dir:
+                # Add folder; its children are loaded on first expand. The
+                # placeholder child gives it an expand arrow, and ttk won't
+                # open an item that has no children
+                node = insert(parent, "end", text=name, image=ico_dir, tags=("dir",))
+                unexpanded[node] = insert(node, "end", text="")
+            else:
+                # Add file
+                node = insert(parent, "end", text=name, image=ico_file)
+            item_path[node] = path
         
+        if end < len(entries):
+            node = insert(parent, "end", text=f"Load more… ({len(entries) - end} remaining)",
+                          tags=("more",))
+            self._pager[node] = (parent, entries, end)
+    
+    def on_load_more(self, event):
+        """Replace a "Load more…" row with the next page of entries"""
+        self._load_page(self.file_tree.identify_row(event.y))
+    
+    def _load_page(self, node):
+        """Swap a "Load more…" row for the entries it stands for"""
+        if node not in self._pager:
+            return
+        parent, entries, offset = self._pager.pop(node)
+        self.file_tree.delete(node)
+        self._insert_entries(parent, entries, offset)
+    
+    def _apply_scan(self, item, entries):
+        """Insert a folder's scanned entries (runs on the Tk thread)"""
+        if not self.file_tree.exists(item):
+            return  # Tree was repopulated while the scan was running
+        # Detach the folder while filling it so Tk skips redraw
+        # bookkeeping for each insert, then put it back in place
+        grand = self.file_tree.parent(item)
+        idx = self.file_tree.index(item)
+        self.file_tree.detach(item)
         try:
-            items = os.listdir(path)
-            # Sort: directories first, then files
-            items.sort(key=lambda x: (not os.path.isdir(os.path.join(path, x)), x.lower()))
-            
-            for item in items:
-                item_path = os.path.join(path, item)
-                if os.path.isdir(item_path):
-                    # Add folder with dummy child to make it expandable
-                    node = self.file_tree.insert(parent, "end", text=f"📁 {item}", 
-                                                 values=[item_path])
-                    self.file_tree.insert(node, "end", text="dummy")  # Dummy child
-                else:
-                    # Add file
-                    self.file_tree.insert(parent, "end", text=f"📄 {item}", 
-                                         values=[item_path])
-        except PermissionError:
-            pass
+            self._insert_entries(item, entries)
+        finally:
+            self.file_tree.move(item, grand, idx)
+        self._force_paint()
+    
+    def _force_paint(self):
+        """
+        Flush pending redraws synchronously. Use this instead of a bare
+        update(), which also delivers queued input events re-entrantly and
+        can cascade into layout storms.
+        """
+        self.root.update_idletasks()
     
     def on_folder_expand(self, event):
         """Handle folder expansion"""
         item = self.file_tree.focus()
-        children = self.file_tree.get_children(item)
         
-        # If only has dummy child, populate it
-        if len(children) == 1 and self.file_tree.item(children[0])["text"] == "dummy":
-            self.file_tree.delete(children[0])
-            path = self.file_tree.item(item)["values"][0]
+        # Populate from an idle callback so every insert lands before the
+        # next redraw instead of painting a half-filled folder
+        if item in self._unexpanded:
+            self.root.after_idle(self._do_expand, item)
+    
+    def _do_expand(self, item):
+        """Scan a folder in the background the first time it is opened"""
+        dummy = self._unexpanded.pop(item, None)
+        if dummy is None:
+            return
+        self.file_tree.delete(dummy)
+        self._io_pool.submit(self._scan_dir, item, self._item_path[item])
+    
+    def _scan_dir(self, item, path):
+        """Worker: scan a directory and hand the result back to the Tk thread"""
+        try:
+            entries = self._scan_entries(path)
+        except OSError as e:
+            # Nobody reads this Future's result, so report the error on the Tk thread
+            self.root.after(0, self._scan_failed, item, path, e)
+            return
+        self.root.after(0, self._apply_scan, item, entries)
+    
+    def _scan_failed(self, item, path, error):
+        """Report a failed folder scan and leave the folder ready to retry"""
+        print(f"Cannot read folder {path}: {error}")
+        if not self.file_tree.exists(item) or item in self._unexpanded:
+            return
+        # Collapse it and restore the placeholder so the next expand rescans
+        self.file_tree.item(item, open=False)
+        self._unexpanded[item] = self.file_tree.insert(item, "end", text="")
+    
+    def schedule_refresh(self, item=""):
+        """
+        Request a tree refresh, coalescing bursts into one pass
+        per _refresh_interval ms. Pass no arguments to refresh the root.
+        """
+        self._refresh_items.add(item)
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        self.root.after(self._refresh_interval, self._do_refresh)
+    
+    def _do_refresh(self):
+        """Run every refresh requested since the last pass"""
+        self._refresh_pending = False
+        items, self._refresh_items = self._refresh_items, set()
+        
+        # A root refresh rebuilds everything, covering any folder requests
+        if "" in items:
+            self.populate_tree()
+            return
+        
+        for item in items:
+            path = self._item_path.get(item)
+            if path is None or not self.file_tree.exists(item):
+                continue  # Removed by an earlier refresh in this pass
+            for child in self.file_tree.get_children(item):
+                self._forget_item(child)
+            self.file_tree.delete(*self.file_tree.get_children(item))
+            # Now populated, so a later expand mustn't add the rows again
+            self._unexpanded.pop(item, None)
             self.populate_tree(item, path)
     
+    def _forget_item(self, item):
+        """Drop cached state for an item and its descendants"""
+        for child in self.file_tree.get_children(item):
+            self._forget_item(child)
+        self._item_path.pop(item, None)
+        self._unexpanded.pop(item, None)
+        self._pager.pop(item, None)
+    
     def on_file_double_click(self, event):
         """Handle file double-click to open"""
         item = self.file_tree.focus()
         if item:
-            values = self.file_tree.item(item)["values"]
-            if values:
-                path = values[0]
-                if os.path.isfile(path):
+            path = self._item_path.get(item)
+            if path:
+                if self._os.path.isfile(path):
                     # Placeholder for opening file
                     print(f"Opening file: {path}")
     
-    # File menu placeholder functions
-    def file_new(self):
-        pass
-    
-    def file_open(self):
-        pass
-    
-    def file_save(self):
-        pass
-    
-    def file_save_as(self):
-        pass
+    @staticmethod
+    def _noop():
+        """Shared handler for menu and toolbar entries not implemented yet"""
     
     def file_exit(self):
         self.root.quit()
     
-    # Edit menu placeholder functions
-    def edit_cut(self):
-        pass
-    
-    def edit_copy(self):
-        pass
-    
-    def edit_paste(self):
-        pass
-    
-    def edit_undo(self):
-        pass
-    
-    def edit_redo(self):
-        pass
-    
-    # View menu placeholder functions
     def view_toggle_sidebar(self):
         """Toggle sidebar visibility"""
         if self.sidebar_visible:
@@ -236,17 +430,6 @@ class CodeEditor:
         else:
             self.paned_window.add(self.left_pane, before=self.right_pane, minsize=200)
             self.sidebar_visible = True
-    
-    def view_zoom_in(self):
-        pass
-    
-    def view_zoom_out(self):
-        pass
-
-        
-    # Run button placeholder function
-    def run_code(self):
-        pass
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,33 @@
+"""
+Lint check for the editor modules
+Fails if any module forces a full Tk event-loop pass with a bare update()
+"""
+
+import os
+import re
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+EDITOR_MODULES = ["main.py", "test2.py"]
+BARE_UPDATE = re.compile(r"\.update\(\)")
+
+
+def test_no_bare_update_calls():
+    """Editor code must use update_idletasks() (or _force_paint) instead of update()"""
+    offenders = []
+    for name in EDITOR_MODULES:
+        with open(os.path.join(ROOT, name), encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if BARE_UPDATE.search(line):
+                    offenders.append(f"{name}:{line_no}: {line.strip()}")
+    assert not offenders, "Bare update() calls found:\n" + "\n".join(offenders)
+
+
+if __name__ == "__main__":
+    try:
+        test_no_bare_update_calls()
+        print("✓ No bare update() calls")
+    except AssertionError as e:
+        print(f"✗ {e}")
+        sys.exit(1)